@@ -0,0 +1,19 @@
+"""Shared fixtures for the manager tests."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+
+import pytest_asyncio
+
+if sys.version_info >= (3, 12, 0):
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _eager_task_factory() -> None:
+        """Run freshly created tasks eagerly up to their first suspension.
+
+        This mirrors create_eager_task in yalexs.backports.tasks and lets
+        scheduled callbacks complete without an extra sleep(0) loop hop.
+        """
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
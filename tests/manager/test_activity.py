@@ -2,14 +2,14 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import pytest_asyncio
 from aiohttp import ClientError
-from freezegun.api import FrozenDateTimeFactory
 
 from yalexs.activity import Activity, ActivityType
-from yalexs.api_async import ApiAsync
 from yalexs.exceptions import AugustApiAIOHTTPError
 from yalexs.manager.activity import (
     ACTIVITY_CATCH_UP_FETCH_LIMIT,
@@ -19,9 +19,55 @@ from yalexs.manager.activity import (
     UPDATE_SOON,
     ActivityStream,
 )
-from yalexs.manager.gateway import Gateway
 
-from ..common import fire_time_changed
+from ..common import FakeClock, advance
+
+_HOUSE_ID = "myhouseid"
+_HOUSE_IDS = frozenset((_HOUSE_ID,))
+
+_COOLDOWN_PLUS_1 = ACTIVITY_DEBOUNCE_COOLDOWN + 1
+
+
+class _StubApi:
+    """Bare-bones ApiAsync stand-in holding only what ActivityStream reads."""
+
+    __slots__ = ("async_get_house_activities",)
+
+
+class _StubGateway:
+    """Bare-bones Gateway stand-in for the token-handling calls."""
+
+    __slots__ = ("async_get_access_token", "async_refresh_access_token_if_needed")
+
+
+class _StubPush:
+    """Bare-bones push stand-in; the stream only reads ``connected``."""
+
+    __slots__ = ("connected",)
+
+    def __init__(self, connected: bool = False) -> None:
+        self.connected = connected
+
+
+class _CallCounter:
+    """Awaitable counter without AsyncMock's per-call bookkeeping.
+
+    The debounce tests only read ``.n``; skipping the ``_Call`` records
+    keeps the hot refresh path cheap.
+    """
+
+    __slots__ = ("n",)
+
+    def __init__(self) -> None:
+        self.n = 0
+
+    def reset(self) -> None:
+        """Zero the call count."""
+        self.n = 0
+
+    async def __call__(self, *args: object, **kwargs: object) -> list[Activity]:
+        self.n += 1
+        return []
 
 
 def _make_activity(
@@ -42,15 +88,15 @@ def _make_activity(
 def _build_stream(
     house_ids: set[str] | None = None,
     push_connected: bool = False,
-) -> tuple[ActivityStream, MagicMock, AsyncMock]:
+) -> tuple[ActivityStream, _StubApi, AsyncMock]:
     """Construct an ActivityStream with stubbed api/gateway/push."""
-    api = MagicMock(spec=ApiAsync)
+    api = _StubApi()
     async_get_house_activities = AsyncMock()
     api.async_get_house_activities = async_get_house_activities
-    gateway = MagicMock(spec=Gateway)
+    gateway = _StubGateway()
     gateway.async_refresh_access_token_if_needed = AsyncMock()
     gateway.async_get_access_token = AsyncMock(return_value="token")
-    push = MagicMock(connected=push_connected)
+    push = _StubPush(connected=push_connected)
     return (
         ActivityStream(api, gateway, house_ids or {"house"}, push),
         api,
@@ -58,179 +104,137 @@ def _build_stream(
     )
 
 
-@pytest.mark.asyncio
-async def test_activity_stream_debounce(freezer: FrozenDateTimeFactory) -> None:
-    """Test activity stream debounce."""
+class Env(NamedTuple):
+    """The ActivityStream under test plus its mocked activities API."""
 
-    api = MagicMock(spec=ApiAsync)
-    async_get_house_activities = AsyncMock()
+    activity: ActivityStream
+    api_mock: AsyncMock
+
+
+@pytest_asyncio.fixture
+async def fake_clock() -> FakeClock:
+    """Take over the running loop's clock for deterministic timer control."""
+    return FakeClock(asyncio.get_running_loop())
+
+
+@pytest_asyncio.fixture
+async def activity_env(fake_clock: FakeClock) -> Env:
+    """Build an ActivityStream wired to stubs and run its initial setup."""
+    api = _StubApi()
+    async_get_house_activities = _CallCounter()
     api.async_get_house_activities = async_get_house_activities
-    august_gateway = MagicMock(spec=Gateway)
+    august_gateway = _StubGateway()
     august_gateway.async_refresh_access_token_if_needed = AsyncMock()
     august_gateway.async_get_access_token = AsyncMock()
-    push = MagicMock(connected=False)
-    august_gateway.push = push
-
-    activity = ActivityStream(api, august_gateway, {"myhouseid"}, push)
+    activity = ActivityStream(api, august_gateway, _HOUSE_IDS, _StubPush())
     await activity.async_setup()
     await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 1
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    assert async_get_house_activities.call_count == 1
-    freezer.tick(INITIAL_LOCK_RESYNC_TIME)
-    fire_time_changed()
-    assert async_get_house_activities.call_count == 1
-    async_get_house_activities.reset_mock()
-    assert "myhouseid" not in activity._schedule_updates
-
-    activity.async_schedule_house_id_refresh("myhouseid")
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 0
-    freezer.tick(UPDATE_SOON)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 1
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 2
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 2
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 2
-    assert "myhouseid" not in activity._schedule_updates
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 2
-    assert "myhouseid" not in activity._schedule_updates
+    # The initial catch-up fetch runs exactly once during setup.
+    assert async_get_house_activities.n == 1
+    return Env(activity, async_get_house_activities)
+
+
+# Steps for test_activity_stream_debounce, applied in order after the
+# initial resync window has passed. Each row holds an action, a delta,
+# the expected api call count, the expected pending-update count, and
+# whether no further update may be scheduled. "schedule" calls
+# async_schedule_house_id_refresh; "advance" moves the frozen clock by
+# delta and fires due timers; the remaining columns are asserted after
+# each step (a pending count of None is skipped).
+_DEBOUNCE_SEQUENCE = (
+    ("schedule", 0, 0, None, False),
+    ("advance", UPDATE_SOON, 1, None, False),
+    ("advance", _COOLDOWN_PLUS_1, 2, None, False),
+    ("advance", _COOLDOWN_PLUS_1, 2, None, False),
+    ("advance", _COOLDOWN_PLUS_1, 2, None, True),
+    ("advance", _COOLDOWN_PLUS_1, 2, None, True),
+    ("schedule", 0, 2, 2, False),
+    ("advance", _COOLDOWN_PLUS_1, 3, 1, False),
+    # Another update request resets the counter but does not poll right
+    # away, and only two polls follow.
+    ("schedule", 0, 3, 2, False),
+    ("advance", _COOLDOWN_PLUS_1, 4, 1, False),
+    ("advance", _COOLDOWN_PLUS_1, 5, 0, False),
+    ("advance", _COOLDOWN_PLUS_1, 5, 0, False),
+    ("advance", _COOLDOWN_PLUS_1, 5, 0, False),
+    ("advance", _COOLDOWN_PLUS_1, 5, None, False),
+    # A later request resets again and polls after UPDATE_SOON with 3 polls.
+    ("schedule", 0, 5, 2, False),
+    ("advance", UPDATE_SOON, 6, 1, False),
+    ("advance", _COOLDOWN_PLUS_1, 7, 0, False),
+    ("advance", _COOLDOWN_PLUS_1, 7, 0, False),
+    ("advance", _COOLDOWN_PLUS_1, 7, 0, False),
+    ("advance", _COOLDOWN_PLUS_1, 7, 0, False),
+)
 
-    activity.async_schedule_house_id_refresh("myhouseid")
-    await asyncio.sleep(0)
-    assert activity._pending_updates["myhouseid"] == 2
-    assert async_get_house_activities.call_count == 2
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 3
-    assert activity._pending_updates["myhouseid"] == 1
 
-    # If we get another update request, be sure we reset
-    # but we do not poll right away and only do 2 polls
-    activity.async_schedule_house_id_refresh("myhouseid")
-    await asyncio.sleep(0)
-    assert activity._pending_updates["myhouseid"] == 2
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert activity._pending_updates["myhouseid"] == 1
-    assert async_get_house_activities.call_count == 4
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert activity._pending_updates["myhouseid"] == 0
-    assert async_get_house_activities.call_count == 5
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert activity._pending_updates["myhouseid"] == 0
-    assert async_get_house_activities.call_count == 5
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 5
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
+async def _run_sequence(
+    clock: FakeClock,
+    env: Env,
+    steps: tuple[tuple[str, float, int, int | None, bool], ...],
+) -> None:
+    """Drive the stream through a table of schedule/advance steps."""
+    activity = env.activity
+    api_mock = env.api_mock
+    for action, delta, expected_count, expected_pending, expect_unscheduled in steps:
+        if action == "schedule":
+            activity.async_schedule_house_id_refresh(_HOUSE_ID)
+        else:
+            await advance(clock, delta)
+        assert api_mock.n == expected_count
+        if expected_pending is not None:
+            assert activity._pending_updates[_HOUSE_ID] == expected_pending
+        if expect_unscheduled:
+            assert _HOUSE_ID not in activity._schedule_updates
 
-    # If we get another update request later, be sure we reset
-    # and poll after 1s with 3 polls
-    activity.async_schedule_house_id_refresh("myhouseid")
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 5
-    assert activity._pending_updates["myhouseid"] == 2
-    freezer.tick(UPDATE_SOON)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 6
-    assert activity._pending_updates["myhouseid"] == 1
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 7
-    assert activity._pending_updates["myhouseid"] == 0
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 7
-    assert activity._pending_updates["myhouseid"] == 0
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 7
-    assert activity._pending_updates["myhouseid"] == 0
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 7
-    assert activity._pending_updates["myhouseid"] == 0
+
+@pytest.mark.asyncio
+async def test_activity_stream_debounce(
+    fake_clock: FakeClock, activity_env: Env
+) -> None:
+    """Test activity stream debounce."""
+    activity = activity_env.activity
+    async_get_house_activities = activity_env.api_mock
+
+    await advance(fake_clock, _COOLDOWN_PLUS_1)
+    assert async_get_house_activities.n == 1
+    await advance(fake_clock, INITIAL_LOCK_RESYNC_TIME)
+    assert async_get_house_activities.n == 1
+    async_get_house_activities.reset()
+    assert _HOUSE_ID not in activity._schedule_updates
+
+    await _run_sequence(fake_clock, activity_env, _DEBOUNCE_SEQUENCE)
 
 
 @pytest.mark.asyncio
 async def test_activity_stream_debounce_during_init(
-    freezer: FrozenDateTimeFactory,
+    fake_clock: FakeClock, activity_env: Env
 ) -> None:
     """Make sure requests during the initial sync get deferred."""
+    activity = activity_env.activity
+    async_get_house_activities = activity_env.api_mock
 
-    api = MagicMock(spec=ApiAsync)
-    async_get_house_activities = AsyncMock()
-    api.async_get_house_activities = async_get_house_activities
-    august_gateway = MagicMock(spec=Gateway)
-    august_gateway.async_refresh_access_token_if_needed = AsyncMock()
-    august_gateway.async_get_access_token = AsyncMock()
-    push = MagicMock(connected=False)
-    august_gateway.push = push
+    await advance(fake_clock, _COOLDOWN_PLUS_1)
 
-    activity = ActivityStream(api, august_gateway, {"myhouseid"}, push)
-    await activity.async_setup()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 1
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-
-    assert async_get_house_activities.call_count == 1
+    assert async_get_house_activities.n == 1
 
-    activity.async_schedule_house_id_refresh("myhouseid")
-    assert activity._pending_updates["myhouseid"] == 1
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 1
+    activity.async_schedule_house_id_refresh(_HOUSE_ID)
+    assert activity._pending_updates[_HOUSE_ID] == 1
+    await advance(fake_clock, _COOLDOWN_PLUS_1)
+    assert async_get_house_activities.n == 1
 
-    activity.async_schedule_house_id_refresh("myhouseid")
-    assert activity._pending_updates["myhouseid"] == 1
-    freezer.tick(ACTIVITY_DEBOUNCE_COOLDOWN + 1)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 1
+    activity.async_schedule_house_id_refresh(_HOUSE_ID)
+    assert activity._pending_updates[_HOUSE_ID] == 1
+    await advance(fake_clock, _COOLDOWN_PLUS_1)
+    assert async_get_house_activities.n == 1
 
-    freezer.tick(INITIAL_LOCK_RESYNC_TIME)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 2
-    assert "myhouseid" not in activity._schedule_updates
+    await advance(fake_clock, INITIAL_LOCK_RESYNC_TIME)
+    assert async_get_house_activities.n == 2
+    assert _HOUSE_ID not in activity._schedule_updates
 
-    freezer.tick(INITIAL_LOCK_RESYNC_TIME)
-    fire_time_changed()
-    await asyncio.sleep(0)
-    assert async_get_house_activities.call_count == 2
-    assert "myhouseid" not in activity._schedule_updates
+    await advance(fake_clock, INITIAL_LOCK_RESYNC_TIME)
+    assert async_get_house_activities.n == 2
+    assert _HOUSE_ID not in activity._schedule_updates
 
 
 @pytest.mark.asyncio
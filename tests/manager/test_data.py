@@ -2,11 +2,13 @@
 
 import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock, patch, sentinel
 
 import pytest
+import pytest_asyncio
 from _pytest.logging import LogCaptureFixture
 from aiohttp import ClientError, ClientResponseError
 
@@ -27,34 +29,90 @@ class MockYaleXSData(YaleXSData):
         """Mock implementation of abstract method."""
 
 
+# Frozen timestamp for push-message tests; none of them assert on time, and
+# a constant avoids the clock call and keeps log output reproducible.
+_FIXED_DT = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+_SENTINEL = object()
+
+# Shared push messages and tracked-state dicts for the push-state tests.
+# _is_unchanged_push_state only reads messages and replaces (never mutates)
+# tracked state, so the same objects are safe to reuse across tests.
+_MSG_LOCKED_CLOSED = {"status": "locked", "doorState": "closed"}
+_MSG_UNLOCKED_OPEN = {"status": "unlocked", "doorState": "open"}
+_MSG_UNLOCKED_CLOSED = {"status": "unlocked", "doorState": "closed"}
+_WS_MSG_LOCKED_CLOSED = {"lockAction": "locked", "doorState": "closed"}
+_WS_MSG_UNLOCKED_OPEN = {"lockAction": "unlocked", "doorState": "open"}
+_STATE_LOCKED_CLOSED = {"lock": "locked", "door": "closed"}
+_STATE_UNLOCKED_OPEN = {"lock": "unlocked", "door": "open"}
+_STATE_UNLOCKED_CLOSED = {"lock": "unlocked", "door": "closed"}
+
+
+@dataclass(slots=True, frozen=True)
+class StubActivity:
+    """Slotted stand-in for the two Activity attributes these tests read."""
+
+    is_status: bool
+    action: str = ""
+
+
+# Canonical instances shared across the push tests; frozen, so reuse is safe.
+_STATUS_ACTIVITY = StubActivity(is_status=True)
+_REAL_ACTIVITY = StubActivity(is_status=False)
+_REAL_LOCK_ACTIVITY = StubActivity(is_status=False, action="lock")
+_STATUS_LOCK_ACTIVITY = StubActivity(is_status=True, action="lock")
+_STATUS_UNLOCK_ACTIVITY = StubActivity(is_status=True, action="unlock")
+
+
+class _PushStateData:
+    """Just the state dict and bound method _is_unchanged_push_state needs."""
+
+    # Bind the actual method from YaleXSData
+    _is_unchanged_push_state = YaleXSData._is_unchanged_push_state
+
+    def __init__(self):
+        self._last_push_state = {}
+
+
+class _PushMessageData:
+    """Enough of YaleXSData to drive the push-message handler end to end."""
+
+    # Bind the actual methods from YaleXSData
+    _is_unchanged_push_state = YaleXSData._is_unchanged_push_state
+    _async_handle_push_message = YaleXSData._async_handle_push_message
+    async_push_message = YaleXSData.async_push_message
+    get_device_detail = YaleXSData.get_device_detail
+
+    def __init__(self):
+        self._last_push_state = {}
+        self._device_detail_by_id = {}
+        self.activity_stream = Mock()
+        self.activity_stream.async_process_newer_device_activities = Mock(
+            return_value=True
+        )
+        self.activity_stream.async_schedule_house_id_refresh = Mock()
+        self.signaled: list[str] = []
+
+    def async_signal_device_id_update(self, device_id):
+        self.signaled.append(device_id)
+
+
 class TestPushStateTracking:
     """Test push state tracking functionality."""
 
+    device_id = "test_device_id"
+
     def setup_method(self):
         """Set up test fixtures."""
-
-        # Create a simple object with just the method and state dict we need
-        class TestData:
-            def __init__(self):
-                self._last_push_state = {}
-
-            # Bind the actual method from YaleXSData
-            _is_unchanged_push_state = YaleXSData._is_unchanged_push_state
-
-        self.data = TestData()
-        self.device_id = "test_device_id"
+        self.data = _PushStateData()
 
     def test_pubnub_initial_status_update_sets_baseline(self):
         """Test that the first PubNub status update sets the baseline state."""
         # First status update should set baseline
-        message1 = {
-            "status": "locked",
-            "doorState": "closed",
-        }
+        message1 = _MSG_LOCKED_CLOSED
 
         # Mock activities that are all status updates
-        mock_activity1 = Mock()
-        mock_activity1.is_status = True
+        mock_activity1 = _STATUS_ACTIVITY
 
         # First call - no previous state
         result1 = self.data._is_unchanged_push_state(
@@ -66,28 +124,18 @@ class TestPushStateTracking:
         # Verify state was tracked
         state_key = f"{self.device_id}:{SOURCE_PUBNUB}"
         assert state_key in self.data._last_push_state
-        assert self.data._last_push_state[state_key] == {
-            "lock": "locked",
-            "door": "closed",
-        }
+        assert self.data._last_push_state[state_key] == _STATE_LOCKED_CLOSED
 
     def test_pubnub_duplicate_status_update_skipped(self):
         """Test that duplicate PubNub status updates are skipped."""
-        message = {
-            "status": "locked",
-            "doorState": "closed",
-        }
+        message = _MSG_LOCKED_CLOSED
 
         # Set initial state
         state_key = f"{self.device_id}:{SOURCE_PUBNUB}"
-        self.data._last_push_state[state_key] = {
-            "lock": "locked",
-            "door": "closed",
-        }
+        self.data._last_push_state[state_key] = _STATE_LOCKED_CLOSED
 
         # Mock activities that are all status updates
-        mock_activity = Mock()
-        mock_activity.is_status = True
+        mock_activity = _STATUS_ACTIVITY
 
         # Same state status update - should be skipped
         result = self.data._is_unchanged_push_state(
@@ -96,29 +144,19 @@ class TestPushStateTracking:
         assert result is True  # Should skip
 
         # State should not have changed
-        assert self.data._last_push_state[state_key] == {
-            "lock": "locked",
-            "door": "closed",
-        }
+        assert self.data._last_push_state[state_key] == _STATE_LOCKED_CLOSED
 
     def test_pubnub_changed_status_update_not_tracked(self):
         """Test that changed PubNub status updates are processed but not tracked."""
         # Set initial state
         state_key = f"{self.device_id}:{SOURCE_PUBNUB}"
-        self.data._last_push_state[state_key] = {
-            "lock": "locked",
-            "door": "closed",
-        }
+        self.data._last_push_state[state_key] = _STATE_LOCKED_CLOSED
 
         # Different state in status update
-        message = {
-            "status": "unlocked",
-            "doorState": "open",
-        }
+        message = _MSG_UNLOCKED_OPEN
 
         # Mock activities that are all status updates
-        mock_activity = Mock()
-        mock_activity.is_status = True
+        mock_activity = _STATUS_ACTIVITY
 
         result = self.data._is_unchanged_push_state(
             self.device_id, message, SOURCE_PUBNUB, [mock_activity]
@@ -126,19 +164,13 @@ class TestPushStateTracking:
         assert result is False  # Should process (state changed)
 
         # State should NOT have been updated (status updates don't track)
-        assert self.data._last_push_state[state_key] == {
-            "lock": "locked",
-            "door": "closed",
-        }
+        assert self.data._last_push_state[state_key] == _STATE_LOCKED_CLOSED
 
     def test_pubnub_real_action_updates_tracking(self):
         """Test that real PubNub actions update state tracking."""
         # Set initial state
         state_key = f"{self.device_id}:{SOURCE_PUBNUB}"
-        self.data._last_push_state[state_key] = {
-            "lock": "locked",
-            "door": "closed",
-        }
+        self.data._last_push_state[state_key] = _STATE_LOCKED_CLOSED
 
         # Real unlock action
         message = {
@@ -149,8 +181,7 @@ class TestPushStateTracking:
         }
 
         # Mock activity that is NOT a status update
-        mock_activity = Mock()
-        mock_activity.is_status = False
+        mock_activity = _REAL_ACTIVITY
 
         result = self.data._is_unchanged_push_state(
             self.device_id, message, SOURCE_PUBNUB, [mock_activity]
@@ -158,84 +189,58 @@ class TestPushStateTracking:
         assert result is False  # Should process
 
         # State SHOULD have been updated (real action)
-        assert self.data._last_push_state[state_key] == {
-            "lock": "unlocked",
-            "door": "closed",
-        }
+        assert self.data._last_push_state[state_key] == _STATE_UNLOCKED_CLOSED
 
     def test_status_update_between_real_actions_doesnt_interfere(self):
         """Test that status updates between real actions don't interfere with detection."""
         state_key = f"{self.device_id}:{SOURCE_PUBNUB}"
 
         # Step 1: Real unlock action
-        message1 = {
-            "status": "unlocked",
-            "doorState": "closed",
-        }
-        mock_activity1 = Mock()
-        mock_activity1.is_status = False
+        message1 = _MSG_UNLOCKED_CLOSED
+        mock_activity1 = _REAL_ACTIVITY
 
         result1 = self.data._is_unchanged_push_state(
             self.device_id, message1, SOURCE_PUBNUB, [mock_activity1]
         )
         assert result1 is False
-        assert self.data._last_push_state[state_key] == {
-            "lock": "unlocked",
-            "door": "closed",
-        }
+        assert self.data._last_push_state[state_key] == _STATE_UNLOCKED_CLOSED
 
         # Step 2: Status update with same state
-        message2 = {
-            "status": "unlocked",
-            "doorState": "closed",
-        }
-        mock_activity2 = Mock()
-        mock_activity2.is_status = True
+        message2 = _MSG_UNLOCKED_CLOSED
+        mock_activity2 = _STATUS_ACTIVITY
 
         result2 = self.data._is_unchanged_push_state(
             self.device_id, message2, SOURCE_PUBNUB, [mock_activity2]
         )
         assert result2 is True  # Should skip (unchanged)
-        assert self.data._last_push_state[state_key] == {
-            "lock": "unlocked",
-            "door": "closed",
-        }  # State unchanged
+        assert (
+            self.data._last_push_state[state_key] == _STATE_UNLOCKED_CLOSED
+        )  # State unchanged
 
         # Step 3: Real lock action
-        message3 = {
-            "status": "locked",
-            "doorState": "closed",
-        }
-        mock_activity3 = Mock()
-        mock_activity3.is_status = False
+        message3 = _MSG_LOCKED_CLOSED
+        mock_activity3 = _REAL_ACTIVITY
 
         result3 = self.data._is_unchanged_push_state(
             self.device_id, message3, SOURCE_PUBNUB, [mock_activity3]
         )
         assert result3 is False  # Should process (real action with changed state)
-        assert self.data._last_push_state[state_key] == {
-            "lock": "locked",
-            "door": "closed",
-        }  # State updated
+        assert (
+            self.data._last_push_state[state_key] == _STATE_LOCKED_CLOSED
+        )  # State updated
 
     def test_websocket_always_tracks_state(self):
         """Test that WebSocket messages always track state changes."""
         state_key = f"{self.device_id}:{SOURCE_WEBSOCKET}"
 
         # First WebSocket message
-        message1 = {
-            "lockAction": "locked",
-            "doorState": "closed",
-        }
+        message1 = _WS_MSG_LOCKED_CLOSED
 
         result1 = self.data._is_unchanged_push_state(
             self.device_id, message1, SOURCE_WEBSOCKET, []
         )
         assert result1 is False
-        assert self.data._last_push_state[state_key] == {
-            "lock": "locked",
-            "door": "closed",
-        }
+        assert self.data._last_push_state[state_key] == _STATE_LOCKED_CLOSED
 
         # Same state - should skip
         result2 = self.data._is_unchanged_push_state(
@@ -244,18 +249,12 @@ class TestPushStateTracking:
         assert result2 is True
 
         # Different state - should process and track
-        message2 = {
-            "lockAction": "unlocked",
-            "doorState": "open",
-        }
+        message2 = _WS_MSG_UNLOCKED_OPEN
         result3 = self.data._is_unchanged_push_state(
             self.device_id, message2, SOURCE_WEBSOCKET, []
         )
         assert result3 is False
-        assert self.data._last_push_state[state_key] == {
-            "lock": "unlocked",
-            "door": "open",
-        }
+        assert self.data._last_push_state[state_key] == _STATE_UNLOCKED_OPEN
 
     def test_separate_tracking_per_source(self):
         """Test that state is tracked separately for each source."""
@@ -263,61 +262,26 @@ class TestPushStateTracking:
         websocket_key = f"{self.device_id}:{SOURCE_WEBSOCKET}"
 
         # Set PubNub state
-        pubnub_message = {
-            "status": "locked",
-            "doorState": "closed",
-        }
-        mock_activity = Mock()
-        mock_activity.is_status = False
+        pubnub_message = _MSG_LOCKED_CLOSED
+        mock_activity = _REAL_ACTIVITY
 
         self.data._is_unchanged_push_state(
             self.device_id, pubnub_message, SOURCE_PUBNUB, [mock_activity]
         )
 
         # Set different WebSocket state
-        websocket_message = {
-            "lockAction": "unlocked",
-            "doorState": "open",
-        }
+        websocket_message = _WS_MSG_UNLOCKED_OPEN
         self.data._is_unchanged_push_state(
             self.device_id, websocket_message, SOURCE_WEBSOCKET, []
         )
 
         # Verify states are tracked separately
-        assert self.data._last_push_state[pubnub_key] == {
-            "lock": "locked",
-            "door": "closed",
-        }
-        assert self.data._last_push_state[websocket_key] == {
-            "lock": "unlocked",
-            "door": "open",
-        }
+        assert self.data._last_push_state[pubnub_key] == _STATE_LOCKED_CLOSED
+        assert self.data._last_push_state[websocket_key] == _STATE_UNLOCKED_OPEN
 
-    def test_unchanged_state_still_processes_newer_activities(self, caplog):
+    def test_unchanged_state_still_processes_newer_activities(self, mocker, caplog):
         """Test that unchanged state messages still process if they have newer activities."""
-
-        # Create a more complete mock data object with required methods
-        class TestDataWithMethods:
-            def __init__(self):
-                self._last_push_state = {}
-                self._device_detail_by_id = {}
-                self.activity_stream = Mock()
-                self.activity_stream.async_process_newer_device_activities = Mock(
-                    return_value=True
-                )
-                self.activity_stream.async_schedule_house_id_refresh = Mock()
-
-            # Bind the actual methods from YaleXSData
-            _is_unchanged_push_state = YaleXSData._is_unchanged_push_state
-            _async_handle_push_message = YaleXSData._async_handle_push_message
-
-            def get_device_detail(self, device_id):
-                return self._device_detail_by_id.get(device_id)
-
-            def async_signal_device_id_update(self, device_id):
-                pass
-
-        data = TestDataWithMethods()
+        data = _PushMessageData()
         device_id = "test_device"
 
         # Create a mock device
@@ -328,10 +292,7 @@ class TestPushStateTracking:
 
         # Set initial state
         state_key = f"{device_id}:{SOURCE_PUBNUB}"
-        data._last_push_state[state_key] = {
-            "lock": "locked",
-            "door": "closed",
-        }
+        data._last_push_state[state_key] = _STATE_LOCKED_CLOSED
 
         # Message with same state but newer timestamp (would have newer activities)
         message = {
@@ -341,75 +302,51 @@ class TestPushStateTracking:
         }
 
         # Mock activity that is not a status update
-        mock_activity = Mock()
-        mock_activity.is_status = False
-        mock_activity.action = "lock"
+        mock_activity = _REAL_LOCK_ACTIVITY
 
-        with (
-            patch(
-                "yalexs.manager.data.activities_from_pubnub_message"
-            ) as mock_activities_func,
-            caplog.at_level(logging.DEBUG),
-        ):
-            mock_activities_func.return_value = [mock_activity]
+        mocker.patch(
+            "yalexs.manager.data.activities_from_pubnub_message",
+            return_value=[mock_activity],
+        )
+        caplog.set_level(logging.DEBUG, logger="yalexs.manager.data")
 
-            # Call the push message handler
-            data._async_handle_push_message(
-                device_id, datetime.now(timezone.utc), message, SOURCE_PUBNUB
-            )
+        # Call the push message handler
+        data._async_handle_push_message(device_id, _FIXED_DT, message, SOURCE_PUBNUB)
 
-            # Verify activities were processed even though state unchanged
-            assert data.activity_stream.async_process_newer_device_activities.called
-            assert data.activity_stream.async_process_newer_device_activities.call_args[
-                0
-            ][0] == [mock_activity]
+        # Verify activities were processed even though state unchanged
+        assert data.activity_stream.async_process_newer_device_activities.called
+        assert data.activity_stream.async_process_newer_device_activities.call_args[0][
+            0
+        ] == [mock_activity]
 
-            # Verify we logged that state was unchanged
-            assert any(
-                "Skipping unchanged" in record.message for record in caplog.records
-            )
+        # Verify we logged that state was unchanged
+        assert any(
+            "Skipping unchanged" in record.getMessage()
+            for record in caplog.get_records("call")
+        )
 
-            # Verify house refresh was NOT scheduled (because unchanged)
-            assert not data.activity_stream.async_schedule_house_id_refresh.called
+        # Verify house refresh was NOT scheduled (because unchanged)
+        assert not data.activity_stream.async_schedule_house_id_refresh.called
 
 
 class TestPushMessageForUnknownDevice:
     """Push messages for devices not in _device_detail_by_id are dropped, not raised."""
 
     def _build_data(self) -> Any:
-        class TestData:
-            def __init__(self):
-                self._last_push_state = {}
-                self._device_detail_by_id = {}
-                self.activity_stream = Mock()
-                self.activity_stream.async_process_newer_device_activities = Mock(
-                    return_value=True
-                )
-                self.activity_stream.async_schedule_house_id_refresh = Mock()
-                self.signaled: list[str] = []
-
-            _is_unchanged_push_state = YaleXSData._is_unchanged_push_state
-            _async_handle_push_message = YaleXSData._async_handle_push_message
-            async_push_message = YaleXSData.async_push_message
-            get_device_detail = YaleXSData.get_device_detail
-
-            def async_signal_device_id_update(self, device_id):
-                self.signaled.append(device_id)
-
-        return TestData()
+        return _PushMessageData()
 
     def test_unknown_device_id_logs_debug_and_returns(self, caplog):
         data = self._build_data()
-        message = {"status": "locked", "doorState": "closed"}
+        message = _MSG_LOCKED_CLOSED
 
         with (
             patch(
                 "yalexs.manager.data.activities_from_pubnub_message"
             ) as mock_activities_func,
-            caplog.at_level(logging.DEBUG),
+            caplog.at_level(logging.DEBUG, logger="yalexs.manager.data"),
         ):
             data._async_handle_push_message(
-                "MISSING_LOCK_ID", datetime.now(timezone.utc), message, SOURCE_PUBNUB
+                "MISSING_LOCK_ID", _FIXED_DT, message, SOURCE_PUBNUB
             )
 
         # We should not have tried to build activities for an unknown device.
@@ -418,8 +355,9 @@ class TestPushMessageForUnknownDevice:
         assert data.signaled == []
         # And we should have logged the skip at debug level.
         assert any(
-            "unknown device" in record.message and "MISSING_LOCK_ID" in record.message
-            for record in caplog.records
+            "unknown device" in record.getMessage()
+            and "MISSING_LOCK_ID" in record.getMessage()
+            for record in caplog.get_records("call")
         )
 
     def test_unknown_device_id_via_async_push_message_does_not_raise(self, caplog):
@@ -433,14 +371,14 @@ class TestPushMessageForUnknownDevice:
         ERROR-level traceback is produced.
         """
         data = self._build_data()
-        message = {"status": "locked", "doorState": "closed"}
+        message = _MSG_LOCKED_CLOSED
 
         with (
             patch("yalexs.manager.data.activities_from_pubnub_message"),
-            caplog.at_level(logging.DEBUG),
+            caplog.at_level(logging.DEBUG, logger="yalexs.manager.data"),
         ):
             data.async_push_message(
-                "MISSING_LOCK_ID", datetime.now(timezone.utc), message, SOURCE_PUBNUB
+                "MISSING_LOCK_ID", _FIXED_DT, message, SOURCE_PUBNUB
             )
 
         error_records = [r for r in caplog.records if r.levelno >= logging.ERROR]
@@ -464,9 +402,7 @@ class TestPushMessageForUnknownDevice:
         mock_device.house_id = "house"
         data._device_detail_by_id[device_id] = mock_device
 
-        mock_activity = Mock()
-        mock_activity.is_status = False
-        mock_activity.action = "lock"
+        mock_activity = _REAL_LOCK_ACTIVITY
 
         with patch(
             "yalexs.manager.data.activities_from_pubnub_message",
@@ -474,8 +410,8 @@ class TestPushMessageForUnknownDevice:
         ):
             data._async_handle_push_message(
                 device_id,
-                datetime.now(timezone.utc),
-                {"status": "locked", "doorState": "closed"},
+                _FIXED_DT,
+                _MSG_LOCKED_CLOSED,
                 SOURCE_PUBNUB,
             )
 
@@ -498,12 +434,8 @@ class TestPushMessageForUnknownDevice:
         mock_device.house_id = "house"
         data._device_detail_by_id[device_id] = mock_device
 
-        status_a = Mock()
-        status_a.is_status = True
-        status_a.action = "lock"
-        status_b = Mock()
-        status_b.is_status = True
-        status_b.action = "unlock"
+        status_a = _STATUS_LOCK_ACTIVITY
+        status_b = _STATUS_UNLOCK_ACTIVITY
 
         with patch(
             "yalexs.manager.data.activities_from_pubnub_message",
@@ -511,8 +443,8 @@ class TestPushMessageForUnknownDevice:
         ):
             data._async_handle_push_message(
                 device_id,
-                datetime.now(timezone.utc),
-                {"status": "locked", "doorState": "closed"},
+                _FIXED_DT,
+                _MSG_LOCKED_CLOSED,
                 SOURCE_PUBNUB,
             )
 
@@ -530,9 +462,7 @@ class TestPushMessageForUnknownDevice:
         mock_device.house_id = "house"
         data._device_detail_by_id[device_id] = mock_device
 
-        mock_activity = Mock()
-        mock_activity.is_status = False
-        mock_activity.action = "lock"
+        mock_activity = _REAL_LOCK_ACTIVITY
 
         with patch(
             "yalexs.manager.data.activities_from_pubnub_message",
@@ -540,8 +470,8 @@ class TestPushMessageForUnknownDevice:
         ):
             data._async_handle_push_message(
                 device_id,
-                datetime.now(timezone.utc),
-                {"status": "locked", "doorState": "closed"},
+                _FIXED_DT,
+                _MSG_LOCKED_CLOSED,
                 SOURCE_PUBNUB,
             )
 
@@ -549,238 +479,293 @@ class TestPushMessageForUnknownDevice:
         assert data.signaled == [device_id]
 
 
-@pytest.mark.asyncio
-async def test_fetch_lock_capabilities() -> None:
-    """Test that lock capabilities are fetched and set correctly."""
-    # Create mock gateway and API
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test-token")
-
-    mock_api = Mock()
-    mock_gateway.api = mock_api
-    mock_gateway.api.brand = Brand.YALE_GLOBAL  # Set brand for capability fetching
-
-    # Create MockYaleXSData instance
-    data = MockYaleXSData(mock_gateway)
+@pytest.fixture
+def make_yale_data() -> Any:
+    """Return a factory building a MockYaleXSData with a mocked gateway.
 
-    # Create mock lock details
-    lock_detail_1 = Mock(spec=LockDetail)
-    lock_detail_1.device_name = "Front Door"
-    lock_detail_1.set_capabilities = Mock()
-
-    lock_detail_2 = Mock(spec=LockDetail)
-    lock_detail_2.device_name = "Back Door"
-    lock_detail_2.set_capabilities = Mock()
+    Rebuilding the Mock/AsyncMock gateway inline was repeated in most
+    tests in this module; the factory keeps construction in one place and
+    each test wires only the attributes it actually uses.
+    """
 
-    # Set up device details
-    # Note: lock_id is the serial number for locks
-    data._device_detail_by_id = {
-        "SERIAL1": lock_detail_1,
-        "SERIAL2": lock_detail_2,
-        "doorbell1": Mock(),  # Not a lock, should be skipped
-    }
-    data._locks_by_id = {
-        "SERIAL1": Mock(),
-        "SERIAL2": Mock(),
-    }
+    def _build(brand: Brand = Brand.YALE_GLOBAL) -> MockYaleXSData:
+        gateway = Mock()
+        gateway.async_get_access_token = _TOKEN_MOCK
+        gateway.api = Mock()
+        gateway.api.brand = brand
+        return MockYaleXSData(gateway)
 
-    # Mock API responses
-    capabilities_1: CapabilitiesResponse = {
-        "lock": {
-            "unlatch": True,
-            "doorSense": True,
-            "batteryType": "AA",
-        }
-    }
-    capabilities_2: CapabilitiesResponse = {
-        "lock": {
-            "unlatch": False,
-            "doorSense": False,
-            "batteryType": "CR123",
-        }
-    }
+    return _build
 
-    # Configure mock API
-    async def mock_get_capabilities(token: str, serial: str) -> CapabilitiesResponse:
-        if serial == "SERIAL1":
-            return capabilities_1
-        if serial == "SERIAL2":
-            return capabilities_2
-        raise ValueError(f"Unknown serial: {serial}")
 
-    mock_api.async_get_lock_capabilities = AsyncMock(side_effect=mock_get_capabilities)
+@pytest_asyncio.fixture
+async def yale_data(make_yale_data: Any) -> MockYaleXSData:
+    """A freshly built MockYaleXSData on a pre-wired mock gateway.
 
-    # Call the method
-    await data._async_fetch_lock_capabilities()
+    Async so construction happens inside the running loop, which the
+    subscriber base class requires.
+    """
+    return make_yale_data()
 
-    # Verify API was called with correct parameters
-    assert mock_api.async_get_lock_capabilities.call_count == 2
-    mock_api.async_get_lock_capabilities.assert_any_call("test-token", "SERIAL1")
-    mock_api.async_get_lock_capabilities.assert_any_call("test-token", "SERIAL2")
 
-    # Verify capabilities were set on lock details
-    lock_detail_1.set_capabilities.assert_called_once_with(capabilities_1)
-    lock_detail_2.set_capabilities.assert_called_once_with(capabilities_2)
+@pytest.fixture
+def lock_detail_spec() -> Mock:
+    """A spec'd LockDetail stand-in; tests set only the attributes they read."""
+    return make_lock_detail()
 
 
-@pytest.mark.asyncio
-async def test_fetch_lock_capabilities_with_error(
-    caplog: pytest.LogCaptureFixture,
-) -> None:
-    """Test that capability fetch errors are handled gracefully."""
-    # Create mock gateway and API
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test-token")
+@pytest.fixture
+def capabilities_env(make_yale_data: Any) -> Any:
+    """Return a builder for a YaleXSData wired for capability fetching.
 
-    mock_api = Mock()
-    mock_gateway.api = mock_api
-    mock_gateway.api.brand = Brand.YALE_GLOBAL  # Set brand for capability fetching
-
-    # Create MockYaleXSData instance
-    data = MockYaleXSData(mock_gateway)
+    The builder takes a ``{serial: device_name}`` mapping plus optional
+    non-lock device ids and returns ``(data, mock_api, details)`` where
+    ``details`` maps each serial to its ``Mock(spec=LockDetail)``.
+    """
 
-    # Create mock lock detail
-    lock_detail = Mock(spec=LockDetail)
-    lock_detail.device_name = "Front Door"
-    lock_detail.set_capabilities = Mock()
+    def _build(
+        locks: dict[str, str], non_locks: tuple[str, ...] = ()
+    ) -> tuple[MockYaleXSData, Mock, dict[str, Mock]]:
+        data = make_yale_data()
+        details = {
+            serial: make_lock_detail(device_name=name, set_capabilities=Mock())
+            for serial, name in locks.items()
+        }
+        # Note: lock_id is the serial number for locks. Non-lock entries
+        # are never introspected, only skipped, so bare objects suffice.
+        data._device_detail_by_id = {
+            **details,
+            **dict.fromkeys(non_locks, _SENTINEL),
+        }
+        data._locks_by_id = dict.fromkeys(details, _SENTINEL)
+        return data, data._api, details
+
+    return _build
+
+
+# Shared capability payloads and August lock JSON, declared once so tests
+# and future parametrizations reference the same objects.
+_CAPS_FULL: CapabilitiesResponse = {
+    "lock": {"unlatch": True, "doorSense": True, "batteryType": "AA"}
+}
+_CAPS_MIN: CapabilitiesResponse = {
+    "lock": {"unlatch": False, "doorSense": False, "batteryType": "CR123"}
+}
+
+_LOCK1_JSON = {
+    "LockID": "ABC1",
+    "LockName": "Lock 1",
+    "HouseID": "house1",
+    "SerialNumber": "SERIAL1",
+    "Type": 5,
+    "battery": 0.8,
+    "currentFirmwareVersion": "1.0.0",
+    "LockStatus": {"status": "locked"},
+}
+_LOCK2_JSON = {
+    "LockID": "ABC2",
+    "LockName": "Lock 2",
+    "HouseID": "house1",
+    "SerialNumber": "SERIAL2",
+    "Type": 17,
+    "battery": 0.9,
+    "currentFirmwareVersion": "1.0.0",
+    "LockStatus": {"status": "unlocked"},
+}
+
+
+def make_lock_detail(**overrides: Any) -> Mock:
+    """Build a spec'd LockDetail stand-in with attributes set in one call.
+
+    The spec has to be the class itself: the capability-fetch path checks
+    isinstance(detail, LockDetail), which only a class spec satisfies.
+    """
+    detail = Mock(spec=LockDetail)
+    detail.configure_mock(**overrides)
+    return detail
 
-    # Set up device details (lock_id is serial number)
-    data._device_detail_by_id = {
-        "SERIAL1": lock_detail,
-    }
-    data._locks_by_id = {
-        "SERIAL1": Mock(),
-    }
 
-    # Mock API to raise an error
+# One token mock shared by every factory-built gateway; AsyncMock
+# construction is comparatively expensive and no test asserts on the
+# token call itself.
+_TOKEN_MOCK = AsyncMock(return_value="test-token")
 
-    mock_api.async_get_lock_capabilities = AsyncMock(
-        side_effect=ClientError("API Error")
-    )
+_REQ_INFO = Mock()
 
-    # Call the method with logging
-    with caplog.at_level(logging.WARNING):
-        await data._async_fetch_lock_capabilities()
 
-    # Verify API was called
-    mock_api.async_get_lock_capabilities.assert_called_once_with(
-        "test-token", "SERIAL1"
+def _api_error(status: int, message: str) -> YaleApiError:
+    """Build a YaleApiError wrapping a ClientResponseError for the status."""
+    return YaleApiError(
+        f"The operation failed with error code {status}: {message}",
+        ClientResponseError(
+            request_info=_REQ_INFO, history=(), status=status, message=message
+        ),
     )
 
-    # Verify capabilities were NOT set due to error
-    lock_detail.set_capabilities.assert_not_called()
 
-    # Verify error was logged
-    assert "Failed to fetch capabilities for lock Front Door" in caplog.text
-    assert "API Error" in caplog.text
+# Built once at import so parametrized sweeps do not pay Mock + exception
+# construction per case.
+_ERRORS = {
+    404: _api_error(404, "Device info not found"),
+    409: _api_error(409, "Cannot infer deviceType from serial number."),
+    401: _api_error(401, "Unauthorized"),
+    500: _api_error(500, "Internal Server Error"),
+}
 
 
 @pytest.mark.asyncio
-async def test_fetch_lock_capabilities_skips_non_locks() -> None:
-    """Test that non-lock devices are skipped when fetching capabilities."""
-    # Create mock gateway and API
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test-token")
-
-    mock_api = Mock()
-    mock_gateway.api = mock_api
-    mock_gateway.api.brand = Brand.YALE_GLOBAL  # Set brand for capability fetching
-
-    # Create MockYaleXSData instance
-    data = MockYaleXSData(mock_gateway)
-
-    # Create mock lock detail
-    lock_detail = Mock(spec=LockDetail)
-    lock_detail.device_name = "Front Door"
-    lock_detail.set_capabilities = Mock()
-
-    # Set up device details with mixed devices
-    data._device_detail_by_id = {
-        "SERIAL1": lock_detail,  # This is a lock
-        "doorbell1": Mock(),  # This is not a lock
-        "doorbell2": Mock(),  # This is not a lock
-    }
-    data._locks_by_id = {
-        "SERIAL1": Mock(),  # Only this one is a lock
-    }
-
-    # Mock API response
-    capabilities: CapabilitiesResponse = {
-        "lock": {
-            "unlatch": True,
-            "doorSense": True,
-            "batteryType": "AA",
-        }
-    }
+@pytest.mark.parametrize(
+    ("locks", "non_locks", "outcomes", "log_level", "expected_texts", "num_warnings"),
+    [
+        pytest.param(
+            {"SERIAL1": "Front Door", "SERIAL2": "Back Door"},
+            ("doorbell1",),
+            {"SERIAL1": _CAPS_FULL, "SERIAL2": _CAPS_MIN},
+            logging.WARNING,
+            [],
+            0,
+            id="success",
+        ),
+        pytest.param(
+            {"SERIAL1": "Front Door"},
+            ("doorbell1", "doorbell2"),
+            {"SERIAL1": _CAPS_FULL},
+            logging.WARNING,
+            [],
+            0,
+            id="skips-non-locks",
+        ),
+        pytest.param(
+            {"SERIAL1": "Front Door"},
+            (),
+            {"SERIAL1": ClientError("API Error")},
+            logging.WARNING,
+            ["Failed to fetch capabilities for lock Front Door", "API Error"],
+            1,
+            id="client-error",
+        ),
+        pytest.param(
+            {"SERIAL404": "Lock 404", "SERIAL409": "Lock 409"},
+            (),
+            {"SERIAL404": _ERRORS[404], "SERIAL409": _ERRORS[409]},
+            logging.DEBUG,
+            [
+                "Cannot fetch capabilities for lock Lock 404 (HTTP 404)",
+                "Cannot fetch capabilities for lock Lock 409 (HTTP 409)",
+            ],
+            0,
+            id="debug-404-409",
+        ),
+        pytest.param(
+            {"SERIAL401": "Lock 401", "SERIAL500": "Lock 500"},
+            (),
+            {"SERIAL401": _ERRORS[401], "SERIAL500": _ERRORS[500]},
+            logging.WARNING,
+            [
+                "Failed to fetch capabilities for lock Lock 401 (HTTP 401)",
+                "Failed to fetch capabilities for lock Lock 500 (HTTP 500)",
+            ],
+            2,
+            id="warns-401-500",
+        ),
+        pytest.param(
+            {"SERIAL_TIMEOUT": "Lock Timeout", "SERIAL_NETWORK": "Lock Network"},
+            (),
+            {
+                "SERIAL_TIMEOUT": TimeoutError("Request timed out"),
+                "SERIAL_NETWORK": ClientError("Network error"),
+            },
+            logging.WARNING,
+            [
+                "Failed to fetch capabilities for lock Lock Timeout: Request timed out",
+                "Failed to fetch capabilities for lock Lock Network: Network error",
+            ],
+            2,
+            id="warns-network-errors",
+        ),
+    ],
+)
+async def test_fetch_lock_capabilities(
+    capabilities_env: Any,
+    caplog: pytest.LogCaptureFixture,
+    locks: dict[str, str],
+    non_locks: tuple[str, ...],
+    outcomes: dict[str, Any],
+    log_level: int,
+    expected_texts: list[str],
+    num_warnings: int,
+) -> None:
+    """Capabilities are set on success; failures log at the right level."""
+    data, mock_api, details = capabilities_env(locks, non_locks)
 
-    mock_api.async_get_lock_capabilities = AsyncMock(return_value=capabilities)
+    def mock_get_capabilities(token: str, serial: str) -> CapabilitiesResponse:
+        outcome = outcomes[serial]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
 
-    # Call the method
-    await data._async_fetch_lock_capabilities()
+    mock_api.async_get_lock_capabilities = AsyncMock(side_effect=mock_get_capabilities)
 
-    # Verify API was called only once (for the lock, not the doorbells)
-    mock_api.async_get_lock_capabilities.assert_called_once_with(
-        "test-token", "SERIAL1"
-    )
+    caplog.clear()
+    with caplog.at_level(log_level, logger="yalexs.manager.data"):
+        await data._async_fetch_lock_capabilities()
 
-    # Verify capabilities were set only on the lock
-    lock_detail.set_capabilities.assert_called_once_with(capabilities)
+    # Only the locks are fetched; non-lock devices are skipped.
+    assert mock_api.async_get_lock_capabilities.call_count == len(locks)
+    for serial, detail in details.items():
+        mock_api.async_get_lock_capabilities.assert_any_call("test-token", serial)
+        outcome = outcomes[serial]
+        if isinstance(outcome, BaseException):
+            detail.set_capabilities.assert_not_called()
+        else:
+            detail.set_capabilities.assert_called_once_with(outcome)
+
+    for expected_text in expected_texts:
+        assert expected_text in caplog.text
+    warning_records = [r for r in caplog.records if r.levelno >= logging.WARNING]
+    assert len(warning_records) == num_warnings
 
 
 @pytest.mark.asyncio
-async def test_fetch_lock_capabilities_sequential_execution() -> None:
-    """Test that capabilities are fetched sequentially, not in parallel."""
-    # Create mock gateway and API
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test-token")
-
-    mock_api = Mock()
-    mock_gateway.api = mock_api
-    mock_gateway.api.brand = Brand.YALE_GLOBAL  # Set brand for capability fetching
-
-    # Create MockYaleXSData instance
-    data = MockYaleXSData(mock_gateway)
-
-    # Create mock lock details
-    lock_detail_1 = Mock(spec=LockDetail)
-    lock_detail_1.device_name = "Front Door"
-    lock_detail_1.set_capabilities = Mock()
-
-    lock_detail_2 = Mock(spec=LockDetail)
-    lock_detail_2.device_name = "Back Door"
-    lock_detail_2.set_capabilities = Mock()
-
-    lock_detail_3 = Mock(spec=LockDetail)
-    lock_detail_3.device_name = "Side Door"
-    lock_detail_3.set_capabilities = Mock()
-
-    # Set up device details
-    data._device_detail_by_id = {
-        "SERIAL1": lock_detail_1,
-        "SERIAL2": lock_detail_2,
-        "SERIAL3": lock_detail_3,
-    }
-    data._locks_by_id = {
-        "SERIAL1": Mock(),
-        "SERIAL2": Mock(),
-        "SERIAL3": Mock(),
+async def test_fetch_lock_capabilities_parallel_execution(make_yale_data: Any) -> None:
+    """Test that capabilities are fetched concurrently, not one at a time."""
+    data = make_yale_data()
+
+    # Create mock lock details in one pass; the values in _locks_by_id are
+    # only checked for membership, so a shared sentinel is enough.
+    lock_details = {
+        f"SERIAL{i}": make_lock_detail(device_name=f"Lock {i}", set_capabilities=Mock())
+        for i in range(1, 4)
     }
 
-    # Track call order
-    call_order: list[str] = []
+    data._device_detail_by_id = dict(lock_details)
+    data._locks_by_id = dict.fromkeys(lock_details, _SENTINEL)
+
+    started: list[str] = []
+    all_started = asyncio.Event()
 
     async def mock_get_capabilities(token: str, serial: str) -> CapabilitiesResponse:
-        call_order.append(serial)
-        return {"lock": {"unlatch": True}}
+        started.append(serial)
+        if len(started) == len(lock_details):
+            all_started.set()
+        # Block until every fetch has started; with serial awaits the
+        # first fetch would never see the others and time out here.
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+        return _CAPS_FULL
 
-    mock_api.async_get_lock_capabilities = AsyncMock(side_effect=mock_get_capabilities)
+    data._api.async_get_lock_capabilities = AsyncMock(side_effect=mock_get_capabilities)
 
     # Call the method
     await data._async_fetch_lock_capabilities()
 
-    # Verify all were called in sequence
-    assert call_order == ["SERIAL1", "SERIAL2", "SERIAL3"]
-    assert mock_api.async_get_lock_capabilities.call_count == 3
+    # Verify every lock was fetched (order is not defined when concurrent)
+    assert set(started) == {"SERIAL1", "SERIAL2", "SERIAL3"}
+    assert data._api.async_get_lock_capabilities.call_count == 3
+    # With serial awaits the barrier would make each fetch time out
+    # instead; the TimeoutError is swallowed and logged, so assert the
+    # capabilities really were applied to every lock.
+    for lock_detail in lock_details.values():
+        lock_detail.set_capabilities.assert_called_once_with(_CAPS_FULL)
 
 
 @pytest.mark.asyncio
@@ -800,30 +785,9 @@ async def test_august_brand_does_not_fetch_capabilities():
     data = MockYaleXSData(mock_gateway)
 
     # Set up test locks
-    lock1 = {
-        "LockID": "ABC1",
-        "LockName": "Lock 1",
-        "HouseID": "house1",
-        "SerialNumber": "SERIAL1",
-        "Type": 5,
-        "battery": 0.8,
-        "currentFirmwareVersion": "1.0.0",
-        "LockStatus": {"status": "locked"},
-    }
-    lock2 = {
-        "LockID": "ABC2",
-        "LockName": "Lock 2",
-        "HouseID": "house1",
-        "SerialNumber": "SERIAL2",
-        "Type": 17,
-        "battery": 0.9,
-        "currentFirmwareVersion": "1.0.0",
-        "LockStatus": {"status": "unlocked"},
-    }
-
     data._lock_details = {
-        "ABC1": LockDetail(lock1),
-        "ABC2": LockDetail(lock2),
+        "ABC1": LockDetail(_LOCK1_JSON),
+        "ABC2": LockDetail(_LOCK2_JSON),
     }
 
     # Mock the capabilities fetch - should not be called
@@ -836,481 +800,177 @@ async def test_august_brand_does_not_fetch_capabilities():
     assert mock_api.async_get_lock_capabilities.call_count == 0
 
 
-@pytest.mark.asyncio
-async def test_fetch_lock_capabilities_handles_404_and_409_errors(
-    caplog: pytest.LogCaptureFixture,
-) -> None:
-    """Test that 404 and 409 errors are handled gracefully when fetching capabilities."""
-    # Create mock gateway and API
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test-token")
-
-    mock_api = Mock()
-    mock_gateway.api = mock_api
-    mock_gateway.api.brand = Brand.YALE_GLOBAL  # Set brand for capability fetching
+# Shared operate-lock results; sentinels make the equality checks identity
+# comparisons and rule out accidental string collisions between cases.
+_LOCK_ACTIVITIES = [sentinel.lock_activity]
+_UNLOCK_ACTIVITIES = [sentinel.unlock_activity]
+_UNLATCH_ACTIVITIES = [sentinel.unlatch_activity]
 
-    # Create MockYaleXSData instance
-    data = MockYaleXSData(mock_gateway)
-
-    # Create mock lock details
-    lock_detail_404 = Mock(spec=LockDetail)
-    lock_detail_404.device_name = "Lock 404"
-    lock_detail_404.set_capabilities = Mock()
-
-    lock_detail_409 = Mock(spec=LockDetail)
-    lock_detail_409.device_name = "Lock 409"
-    lock_detail_409.set_capabilities = Mock()
-
-    # Set up device details
-    data._device_detail_by_id = {
-        "SERIAL404": lock_detail_404,
-        "SERIAL409": lock_detail_409,
-    }
-    data._locks_by_id = {
-        "SERIAL404": Mock(),
-        "SERIAL409": Mock(),
-    }
-
-    # Mock API to raise 404 and 409 errors
-    async def mock_get_capabilities(token: str, serial: str) -> None:
-        if serial == "SERIAL404":
-            error = YaleApiError(
-                "The operation failed with error code 404: Device info not found.",
-                ClientResponseError(
-                    request_info=Mock(),
-                    history=(),
-                    status=404,
-                    message="Device info not found",
-                ),
-            )
-            raise error
-        if serial == "SERIAL409":
-            error = YaleApiError(
-                "The operation failed with error code 409: Cannot infer deviceType from serial number.",
-                ClientResponseError(
-                    request_info=Mock(),
-                    history=(),
-                    status=409,
-                    message="Cannot infer deviceType from serial number.",
-                ),
-            )
-            raise error
-
-    mock_api.async_get_lock_capabilities = AsyncMock(side_effect=mock_get_capabilities)
-
-    # Call the method with debug logging
-    with caplog.at_level(logging.DEBUG):
-        await data._async_fetch_lock_capabilities()
-
-    # Verify API was called for both locks
-    assert mock_api.async_get_lock_capabilities.call_count == 2
-
-    # Verify capabilities were NOT set due to errors
-    lock_detail_404.set_capabilities.assert_not_called()
-    lock_detail_409.set_capabilities.assert_not_called()
-
-    # Verify debug messages were logged (not warnings)
-    assert "Cannot fetch capabilities for lock Lock 404 (HTTP 404)" in caplog.text
-    assert "Cannot fetch capabilities for lock Lock 409 (HTTP 409)" in caplog.text
-    # Verify no warning logs for these expected errors
-    warning_records = [r for r in caplog.records if r.levelno >= logging.WARNING]
-    assert len(warning_records) == 0
-
-
-@pytest.mark.asyncio
-async def test_fetch_lock_capabilities_handles_other_errors_with_warning(
-    caplog: pytest.LogCaptureFixture,
-) -> None:
-    """Test that non-404/409 errors are logged as warnings when fetching capabilities."""
-    # Create mock gateway and API
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test-token")
-
-    mock_api = Mock()
-    mock_gateway.api = mock_api
-    mock_gateway.api.brand = Brand.YALE_GLOBAL  # Set brand for capability fetching
-
-    # Create MockYaleXSData instance
-    data = MockYaleXSData(mock_gateway)
-
-    # Create mock lock details
-    lock_detail_401 = Mock(spec=LockDetail)
-    lock_detail_401.device_name = "Lock 401"
-    lock_detail_401.set_capabilities = Mock()
-
-    lock_detail_500 = Mock(spec=LockDetail)
-    lock_detail_500.device_name = "Lock 500"
-    lock_detail_500.set_capabilities = Mock()
-
-    # Set up device details
-    data._device_detail_by_id = {
-        "SERIAL401": lock_detail_401,
-        "SERIAL500": lock_detail_500,
-    }
-    data._locks_by_id = {
-        "SERIAL401": Mock(),
-        "SERIAL500": Mock(),
-    }
-
-    # Mock API to raise 401 and 500 errors
-    async def mock_get_capabilities(token: str, serial: str) -> None:
-        if serial == "SERIAL401":
-            error = YaleApiError(
-                "The operation failed with error code 401: Unauthorized.",
-                ClientResponseError(
-                    request_info=Mock(),
-                    history=(),
-                    status=401,
-                    message="Unauthorized",
-                ),
-            )
-            raise error
-        if serial == "SERIAL500":
-            error = YaleApiError(
-                "The operation failed with error code 500: Internal Server Error.",
-                ClientResponseError(
-                    request_info=Mock(),
-                    history=(),
-                    status=500,
-                    message="Internal Server Error",
-                ),
-            )
-            raise error
-
-    mock_api.async_get_lock_capabilities = AsyncMock(side_effect=mock_get_capabilities)
-
-    # Call the method with warning logging
-    with caplog.at_level(logging.WARNING):
-        await data._async_fetch_lock_capabilities()
-
-    # Verify API was called for both locks
-    assert mock_api.async_get_lock_capabilities.call_count == 2
-
-    # Verify capabilities were NOT set due to errors
-    lock_detail_401.set_capabilities.assert_not_called()
-    lock_detail_500.set_capabilities.assert_not_called()
-
-    # Verify warning messages were logged for non-404/409 errors
-    assert "Failed to fetch capabilities for lock Lock 401 (HTTP 401)" in caplog.text
-    assert "Failed to fetch capabilities for lock Lock 500 (HTTP 500)" in caplog.text
-
-    # Verify these are logged as warnings, not debug
-    warning_records = [r for r in caplog.records if r.levelno >= logging.WARNING]
-    assert len(warning_records) == 2
+_OPERATION_MOCKS = (
+    "async_lock",
+    "async_unlock",
+    "async_unlatch",
+    "async_lock_async",
+    "async_unlock_async",
+    "async_unlatch_async",
+)
 
 
 @pytest.mark.asyncio
-async def test_fetch_lock_capabilities_handles_network_errors(
-    caplog: pytest.LogCaptureFixture,
+@pytest.mark.parametrize(
+    (
+        "operation",
+        "push",
+        "unlatch",
+        "call_kwargs",
+        "expected_call",
+        "expected_args",
+        "expected_result",
+    ),
+    [
+        pytest.param(
+            LockOperation.LOCK,
+            False,
+            False,
+            {},
+            "async_lock",
+            ("test_device",),
+            _LOCK_ACTIVITIES,
+            id="lock-wait",
+        ),
+        pytest.param(
+            LockOperation.LOCK,
+            True,
+            False,
+            {"hyper_bridge": True},
+            "async_lock_async",
+            ("test_device", True),
+            [],
+            id="lock-push",
+        ),
+        pytest.param(
+            LockOperation.UNLOCK,
+            False,
+            False,
+            {},
+            "async_unlock",
+            ("test_device",),
+            _UNLOCK_ACTIVITIES,
+            id="unlock-no-unlatch",
+        ),
+        # When unlatch is supported, UNLOCK should call unlatch!
+        pytest.param(
+            LockOperation.UNLOCK,
+            False,
+            True,
+            {},
+            "async_unlatch",
+            ("test_device",),
+            _UNLATCH_ACTIVITIES,
+            id="unlock-with-unlatch",
+        ),
+        pytest.param(
+            LockOperation.OPEN,
+            False,
+            False,
+            {},
+            "async_unlatch",
+            ("test_device",),
+            _UNLATCH_ACTIVITIES,
+            id="open-no-unlatch",
+        ),
+        # When unlatch is supported, OPEN should call unlock!
+        pytest.param(
+            LockOperation.OPEN,
+            False,
+            True,
+            {},
+            "async_unlock",
+            ("test_device",),
+            _UNLOCK_ACTIVITIES,
+            id="open-with-unlatch",
+        ),
+        pytest.param(
+            LockOperation.LOCK,
+            True,
+            True,
+            {},
+            "async_lock_async",
+            ("test_device", True),
+            [],
+            id="lock-push-unlatch",
+        ),
+        pytest.param(
+            LockOperation.UNLOCK,
+            True,
+            True,
+            {},
+            "async_unlatch_async",
+            ("test_device", True),
+            [],
+            id="unlock-push-unlatch",
+        ),
+        pytest.param(
+            LockOperation.OPEN,
+            True,
+            True,
+            {},
+            "async_unlock_async",
+            ("test_device", True),
+            [],
+            id="open-push-unlatch",
+        ),
+    ],
+)
+async def test_async_operate_lock_matrix(
+    yale_data: MockYaleXSData,
+    lock_detail_spec: Mock,
+    operation: LockOperation,
+    push: bool,
+    unlatch: bool,
+    call_kwargs: dict[str, Any],
+    expected_call: str,
+    expected_args: tuple[Any, ...],
+    expected_result: list[Any],
 ) -> None:
-    """Test that network errors like ClientError and TimeoutError are handled gracefully."""
-    # Create mock gateway and API
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test-token")
-
-    mock_api = Mock()
-    mock_gateway.api = mock_api
-    mock_gateway.api.brand = Brand.YALE_GLOBAL  # Set brand for capability fetching
-
-    # Create MockYaleXSData instance
-    data = MockYaleXSData(mock_gateway)
-
-    # Create mock lock details
-    lock_detail_timeout = Mock(spec=LockDetail)
-    lock_detail_timeout.device_name = "Lock Timeout"
-    lock_detail_timeout.set_capabilities = Mock()
-
-    lock_detail_network = Mock(spec=LockDetail)
-    lock_detail_network.device_name = "Lock Network"
-    lock_detail_network.set_capabilities = Mock()
-
-    # Set up device details
-    data._device_detail_by_id = {
-        "SERIAL_TIMEOUT": lock_detail_timeout,
-        "SERIAL_NETWORK": lock_detail_network,
-    }
-    data._locks_by_id = {
-        "SERIAL_TIMEOUT": Mock(),
-        "SERIAL_NETWORK": Mock(),
-    }
-
-    # Mock API to raise TimeoutError and ClientError
-    async def mock_get_capabilities(token: str, serial: str) -> None:
-        if serial == "SERIAL_TIMEOUT":
-            raise TimeoutError("Request timed out")
-        if serial == "SERIAL_NETWORK":
-            raise ClientError("Network error")
-
-    mock_api.async_get_lock_capabilities = AsyncMock(side_effect=mock_get_capabilities)
-
-    # Call the method with warning logging
-    with caplog.at_level(logging.WARNING):
-        await data._async_fetch_lock_capabilities()
-
-    # Verify API was called for both locks
-    assert mock_api.async_get_lock_capabilities.call_count == 2
-
-    # Verify capabilities were NOT set due to errors
-    lock_detail_timeout.set_capabilities.assert_not_called()
-    lock_detail_network.set_capabilities.assert_not_called()
-
-    # Verify warning messages were logged for network errors
-    assert (
-        "Failed to fetch capabilities for lock Lock Timeout: Request timed out"
-        in caplog.text
-    )
-    assert (
-        "Failed to fetch capabilities for lock Lock Network: Network error"
-        in caplog.text
-    )
-
-    # Verify these are logged as warnings
-    warning_records = [r for r in caplog.records if r.levelno >= logging.WARNING]
-    assert len(warning_records) == 2
-
-
-@pytest.mark.asyncio
-async def test_async_operate_lock_wait_mode() -> None:
-    """Test async_operate_lock LOCK operation when waiting for response."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
-
-    # Mock the individual lock operation methods
-    data.async_lock = AsyncMock(return_value=["lock_activity"])
-    data.async_lock_async = AsyncMock(return_value="lock_request_id")
-
-    device_id = "test_device"
-
-    # Mock device detail without unlatch support
-    mock_detail = Mock(spec=LockDetail)
-    mock_detail.unlatch_supported = False
-    data.get_device_detail = Mock(return_value=mock_detail)
-
-    result = await data.async_operate_lock(
-        device_id, LockOperation.LOCK, push_updates_connected=False
-    )
-
-    assert result == ["lock_activity"]
-    data.async_lock.assert_called_once_with(device_id)
-    data.async_lock_async.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_async_operate_lock_push_mode() -> None:
-    """Test async_operate_lock LOCK operation with push updates (no wait)."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
+    """Operation x push x unlatch dispatch matrix for async_operate_lock.
 
-    # Mock the individual lock operation methods
-    data.async_lock = AsyncMock(return_value=["lock_activity"])
-    data.async_lock_async = AsyncMock(return_value="lock_request_id")
-
-    device_id = "test_device"
-
-    # Mock device detail without unlatch support
-    mock_detail = Mock(spec=LockDetail)
-    mock_detail.unlatch_supported = False
-    data.get_device_detail = Mock(return_value=mock_detail)
-
-    result = await data.async_operate_lock(
-        device_id, LockOperation.LOCK, push_updates_connected=True, hyper_bridge=True
-    )
-
-    assert result == []  # Returns empty list when not waiting
-    data.async_lock.assert_not_called()
-    data.async_lock_async.assert_called_once_with(device_id, True)
-
-
-@pytest.mark.asyncio
-async def test_async_operate_unlock_no_unlatch_support() -> None:
-    """Test async_operate_lock UNLOCK operation when device doesn't support unlatch."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
-
-    # Mock the individual lock operation methods
-    data.async_unlock = AsyncMock(return_value=["unlock_activity"])
-    data.async_unlatch = AsyncMock(return_value=["unlatch_activity"])
-
-    device_id = "test_device"
-
-    # Mock device detail without unlatch support
-    mock_detail = Mock(spec=LockDetail)
-    mock_detail.unlatch_supported = False
-    data.get_device_detail = Mock(return_value=mock_detail)
-
-    result = await data.async_operate_lock(
-        device_id, LockOperation.UNLOCK, push_updates_connected=False
-    )
-
-    assert result == ["unlock_activity"]
-    data.async_unlock.assert_called_once_with(device_id)
-    data.async_unlatch.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_async_operate_unlock_with_unlatch_support() -> None:
-    """Test async_operate_lock UNLOCK operation when device supports unlatch (should call unlatch)."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
-
-    # Mock the individual lock operation methods
-    data.async_unlock = AsyncMock(return_value=["unlock_activity"])
-    data.async_unlatch = AsyncMock(return_value=["unlatch_activity"])
-
-    device_id = "test_device"
-
-    # Mock device detail WITH unlatch support
-    mock_detail = Mock(spec=LockDetail)
-    mock_detail.unlatch_supported = True
-    data.get_device_detail = Mock(return_value=mock_detail)
-
-    result = await data.async_operate_lock(
-        device_id, LockOperation.UNLOCK, push_updates_connected=False
-    )
-
-    # When unlatch is supported, UNLOCK should call unlatch!
-    assert result == ["unlatch_activity"]
-    data.async_unlatch.assert_called_once_with(device_id)
-    data.async_unlock.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_async_operate_open_no_unlatch_support() -> None:
-    """Test async_operate_lock OPEN operation when device doesn't support unlatch."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
-
-    # Mock the individual lock operation methods
-    data.async_unlock = AsyncMock(return_value=["unlock_activity"])
-    data.async_unlatch = AsyncMock(return_value=["unlatch_activity"])
-
-    device_id = "test_device"
-
-    # Mock device detail without unlatch support
-    mock_detail = Mock(spec=LockDetail)
-    mock_detail.unlatch_supported = False
-    data.get_device_detail = Mock(return_value=mock_detail)
-
-    result = await data.async_operate_lock(
-        device_id, LockOperation.OPEN, push_updates_connected=False
-    )
-
-    assert result == ["unlatch_activity"]
-    data.async_unlatch.assert_called_once_with(device_id)
-    data.async_unlock.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_async_operate_open_with_unlatch_support() -> None:
-    """Test async_operate_lock OPEN operation when device supports unlatch (should call unlock)."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
-
-    # Mock the individual lock operation methods
-    data.async_unlock = AsyncMock(return_value=["unlock_activity"])
-    data.async_unlatch = AsyncMock(return_value=["unlatch_activity"])
-
-    device_id = "test_device"
-
-    # Mock device detail WITH unlatch support
-    mock_detail = Mock(spec=LockDetail)
-    mock_detail.unlatch_supported = True
-    data.get_device_detail = Mock(return_value=mock_detail)
-
-    result = await data.async_operate_lock(
-        device_id, LockOperation.OPEN, push_updates_connected=False
-    )
-
-    # When unlatch is supported, OPEN should call unlock!
-    assert result == ["unlock_activity"]
-    data.async_unlock.assert_called_once_with(device_id)
-    data.async_unlatch.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_async_operate_lock_all_operations_with_push() -> None:
-    """Test async_operate_lock all operations with push updates enabled."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
-
-    # Mock all async operation methods
-    data.async_lock_async = AsyncMock(return_value="lock_request_id")
-    data.async_unlock_async = AsyncMock(return_value="unlock_request_id")
-    data.async_unlatch_async = AsyncMock(return_value="unlatch_request_id")
-
-    device_id = "test_device"
-
-    # Mock device detail with unlatch support
-    mock_detail = Mock(spec=LockDetail)
-    mock_detail.unlatch_supported = True
-    data.get_device_detail = Mock(return_value=mock_detail)
-
-    # Test LOCK operation
-    result = await data.async_operate_lock(
-        device_id, LockOperation.LOCK, push_updates_connected=True
-    )
-    assert result == []
-    data.async_lock_async.assert_called_once_with(device_id, True)
-
-    # Reset mocks
-    data.async_lock_async.reset_mock()
-    data.async_unlock_async.reset_mock()
-    data.async_unlatch_async.reset_mock()
+    Push mode returns an empty list without waiting, and a lock that
+    supports unlatching swaps the UNLOCK and OPEN operations.
+    """
+    data = yale_data
+    data.async_lock = AsyncMock(return_value=_LOCK_ACTIVITIES)
+    data.async_unlock = AsyncMock(return_value=_UNLOCK_ACTIVITIES)
+    data.async_unlatch = AsyncMock(return_value=_UNLATCH_ACTIVITIES)
+    data.async_lock_async = AsyncMock(return_value=sentinel.lock_request_id)
+    data.async_unlock_async = AsyncMock(return_value=sentinel.unlock_request_id)
+    data.async_unlatch_async = AsyncMock(return_value=sentinel.unlatch_request_id)
+    operation_mocks = {name: getattr(data, name) for name in _OPERATION_MOCKS}
+
+    lock_detail_spec.unlatch_supported = unlatch
+    data.get_device_detail = Mock(return_value=lock_detail_spec)
 
-    # Test UNLOCK (should call unlatch_async when unlatch supported)
     result = await data.async_operate_lock(
-        device_id, LockOperation.UNLOCK, push_updates_connected=True
+        "test_device", operation, push_updates_connected=push, **call_kwargs
     )
-    assert result == []
-    data.async_unlatch_async.assert_called_once_with(device_id, True)
-
-    # Reset mocks
-    data.async_lock_async.reset_mock()
-    data.async_unlock_async.reset_mock()
-    data.async_unlatch_async.reset_mock()
 
-    # Test OPEN (should call unlock_async when unlatch supported)
-    result = await data.async_operate_lock(
-        device_id, LockOperation.OPEN, push_updates_connected=True
-    )
-    assert result == []
-    data.async_unlock_async.assert_called_once_with(device_id, True)
+    assert result == expected_result
+    operation_mocks.pop(expected_call).assert_called_once_with(*expected_args)
+    for other_mock in operation_mocks.values():
+        other_mock.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_async_operate_lock_invalid_operation() -> None:
+async def test_async_operate_lock_invalid_operation(
+    yale_data: MockYaleXSData, lock_detail_spec: Mock
+) -> None:
     """Test async_operate_lock with invalid operation raises ValueError."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
+    data = yale_data
 
     device_id = "test_device"
 
     # Mock device detail
-    mock_detail = Mock(spec=LockDetail)
+    mock_detail = lock_detail_spec
     mock_detail.unlatch_supported = False
     data.get_device_detail = Mock(return_value=mock_detail)
 
@@ -1325,17 +985,13 @@ async def test_async_operate_lock_invalid_operation() -> None:
 
 
 @pytest.mark.asyncio
-async def test_async_operate_lock_no_device_detail() -> None:
+async def test_async_operate_lock_no_device_detail(yale_data: MockYaleXSData) -> None:
     """Test async_operate_lock when get_device_detail returns None."""
-    mock_gateway = Mock()
-    mock_gateway.async_get_access_token = AsyncMock(return_value="test_token")
-    mock_api = Mock()
-
-    data = MockYaleXSData(mock_gateway, mock_api)
+    data = yale_data
 
     # Mock the individual lock operation methods
-    data.async_unlock = AsyncMock(return_value=["unlock_activity"])
-    data.async_unlatch = AsyncMock(return_value=["unlatch_activity"])
+    data.async_unlock = AsyncMock(return_value=_UNLOCK_ACTIVITIES)
+    data.async_unlatch = AsyncMock(return_value=_UNLATCH_ACTIVITIES)
 
     device_id = "test_device"
 
@@ -1347,7 +1003,7 @@ async def test_async_operate_lock_no_device_detail() -> None:
     )
 
     # Should use normal mapping (unlock -> unlock)
-    assert result == ["unlock_activity"]
+    assert result == _UNLOCK_ACTIVITIES
     data.async_unlock.assert_called_once_with(device_id)
     data.async_unlatch.assert_not_called()
 
@@ -2046,7 +1702,7 @@ async def test_async_push_message_catches_unexpected_exceptions(
         caplog.at_level(logging.ERROR),
     ):
         # Should NOT raise.
-        data.async_push_message("dev", datetime.now(timezone.utc), {}, SOURCE_PUBNUB)
+        data.async_push_message("dev", _FIXED_DT, {}, SOURCE_PUBNUB)
 
     assert "Error processing push message" in caplog.text
     assert "kaboom" in caplog.text
@@ -2123,7 +1779,7 @@ async def test_async_handle_push_message_status_only_short_circuits() -> None:
     ):
         data._async_handle_push_message(
             "d",
-            datetime.now(timezone.utc),
+            _FIXED_DT,
             {"status": "locked", "doorState": "closed"},
             SOURCE_PUBNUB,
         )
@@ -2161,7 +1817,7 @@ async def test_handle_push_message_logs_and_skips_status_activities_when_state_c
     ):
         data._async_handle_push_message(
             "d",
-            datetime.now(timezone.utc),
+            _FIXED_DT,
             {"status": "locked", "doorState": "closed"},
             SOURCE_PUBNUB,
         )
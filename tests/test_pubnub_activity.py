@@ -1,9 +1,10 @@
 import datetime
 import json
 import os
-import unittest
+from functools import cache
 
 import dateutil.parser
+import pytest
 from dateutil.tz import tzlocal
 
 from yalexs.activity import (
@@ -30,355 +31,358 @@ from yalexs.pubnub_activity import activities_from_pubnub_message
 from yalexs.users import cache_user_info, get_user_info
 
 
+def _parse(timestamp: str) -> datetime.datetime:
+    """Parse an ISO-8601 timestamp, falling back to dateutil.
+
+    fromisoformat handles every well-formed fixture timestamp here and is
+    roughly an order of magnitude faster than dateutil's generic parser.
+    """
+    try:
+        return datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return dateutil.parser.parse(timestamp)
+
+
+@cache
 def load_fixture(filename):
-    """Load a fixture."""
+    """Load a fixture, reading each file from disk at most once."""
     path = os.path.join(os.path.dirname(__file__), "fixtures", filename)
     with open(path) as fptr:
         return fptr.read()
 
 
-class TestLockDetail(unittest.TestCase):
-    def test_update_lock_details_from_pubnub_message(self):
-        lock = LockDetail(json.loads(load_fixture("get_lock.doorsense_init.json")))
-        self.assertEqual("A6697750D607098BAE8D6BAA11EF8063", lock.device_id)
-        self.assertEqual(LockStatus.LOCKED, lock.lock_status)
-        self.assertEqual(LockDoorStatus.DISABLED, lock.door_state)
+def _check_activities(activities, expected):
+    """Assert each activity matches an (activity class, attributes) pair."""
+    assert len(activities) == len(expected)
+    for activity, (cls, attrs) in zip(activities, expected, strict=True):
+        assert isinstance(activity, cls)
+        assert cls.__name__ in str(activity)
+        for attr, value in attrs.items():
+            assert getattr(activity, attr) == value
+
+
+@cache
+def _load_json_fixture(filename):
+    """Load and decode a JSON fixture, caching the parsed document."""
+    return json.loads(load_fixture(filename))
+
+
+@pytest.fixture(scope="module")
+def lock_detail():
+    """Return a LockDetail parsed once per module; tests only read from it."""
+    return LockDetail(_load_json_fixture("get_lock.doorsense_init.json"))
+
+
+@pytest.fixture(scope="module")
+def doorbell_detail():
+    """Return a DoorbellDetail parsed once per module; tests only read from it."""
+    return DoorbellDetail(_load_json_fixture("get_doorbell.json"))
+
+
+# Timestamps shared by many of the pubnub messages below, parsed once.
+_TS_BASE = _parse("2017-12-10T05:48:30.272Z")
+_TS_BASE_NEXT = _parse("2017-12-10T05:48:31.273Z")
+_TS_LATER = _parse("2017-12-10T11:48:30.272Z")
+_TS_UNLATCH = _parse("2021-03-20T18:19:06.374Z")
+_TS_IMAGECAPTURE = _parse("2021-03-16T01:07:08.817Z")
+# tzlocal() walks the system zone info on every call; resolve it once.
+_TZ_LOCAL = tzlocal()
+# Timestamps for the manual lock/unlock/unlatch messages, from the pubnub
+# epoch-with-100ns-precision wire format.
+_TS_MANUAL_UNLATCH = datetime.datetime.fromtimestamp(
+    16844292526891571 / 10_000_000, tz=datetime.timezone.utc
+)
+_TS_MANUAL_LOCK = datetime.datetime.fromtimestamp(
+    16844299539729015 / 10_000_000, tz=datetime.timezone.utc
+)
+# activity_start_time is naive local time; convert the expected value once.
+_TS_UNLATCH_LOCAL = _TS_UNLATCH.astimezone(tz=_TZ_LOCAL).replace(tzinfo=None)
+
+# Templates for the "info" payload repeated across the lock messages below.
+# activities_from_pubnub_message annotates info in place, so call sites must
+# unpack these into fresh dicts instead of passing the templates directly.
+_BASE_CONTEXT = {
+    "transactionID": "_oJRZKJsx",
+    "startDate": "2021-03-20T18:19:05.371Z",
+    "retryCount": 1,
+}
+_BASE_INFO = {
+    "action": "unlock",
+    "startTime": "2021-03-20T18:19:05.373Z",
+    "context": _BASE_CONTEXT,
+    "lockType": "lock_version_1001",
+    "serialNumber": "M1FBA029QJ",
+    "rssi": -53,
+    "wlanRSSI": -55,
+    "wlanSNR": 44,
+    "duration": 2534,
+}
+# The doorbell handler setdefaults keys onto "data", so call sites unpack a
+# fresh copy of it just like they do for _BASE_INFO.
+_IMAGECAPTURE_MSG = {
+    "status": "imagecapture",
+    "data": {
+        "event": "imagecapture",
+        "result": {
+            "created_at": "2021-03-16T01:07:08.817Z",
+            "secure_url": "https://dyu7azbnaoi74.cloudfront.net/zip/images/zip.jpeg",
+        },
+    },
+}
+
+
+def test_lock_detail_fixture_parses(lock_detail):
+    """Sanity-check the detail the pubnub lock tests run against."""
+    assert lock_detail.device_id == "A6697750D607098BAE8D6BAA11EF8063"
+    assert lock_detail.lock_status == LockStatus.LOCKED
+    assert lock_detail.door_state == LockDoorStatus.DISABLED
+
 
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
+@pytest.mark.parametrize(
+    ("timestamp", "message", "expected"),
+    [
+        pytest.param(
+            _TS_BASE,
             {
                 "remoteEvent": 1,
                 "status": "kAugLockState_Unlatching",
-                "info": {
-                    "action": "unlock",
-                    "startTime": "2021-03-20T18:19:05.373Z",
-                    "context": {
-                        "transactionID": "_oJRZKJsx",
-                        "startDate": "2021-03-20T18:19:05.371Z",
-                        "retryCount": 1,
-                    },
-                    "lockType": "lock_version_1001",
-                    "serialNumber": "M1FBA029QJ",
-                    "rssi": -53,
-                    "wlanRSSI": -55,
-                    "wlanSNR": 44,
-                    "duration": 2534,
-                },
+                "info": {**_BASE_INFO, "context": {**_BASE_CONTEXT}},
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "unlatching"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
+            [(LockOperationActivity, {"action": "unlatching"})],
+            id="unlatching",
+        ),
+        pytest.param(
+            _TS_BASE,
             {
                 "remoteEvent": 1,
                 "status": "kAugLockState_Unlocking",
-                "info": {
-                    "action": "unlock",
-                    "startTime": "2021-03-20T18:19:05.373Z",
-                    "context": {
-                        "transactionID": "_oJRZKJsx",
-                        "startDate": "2021-03-20T18:19:05.371Z",
-                        "retryCount": 1,
-                    },
-                    "lockType": "lock_version_1001",
-                    "serialNumber": "M1FBA029QJ",
-                    "rssi": -53,
-                    "wlanRSSI": -55,
-                    "wlanSNR": 44,
-                    "duration": 2534,
-                },
+                "info": {**_BASE_INFO, "context": {**_BASE_CONTEXT}},
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "unlocking"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:31.273Z"),
+            [(LockOperationActivity, {"action": "unlocking"})],
+            id="unlocking",
+        ),
+        pytest.param(
+            _TS_BASE_NEXT,
             {
                 "remoteEvent": 1,
                 "status": "kAugLockState_Locking",
                 "info": {
-                    "action": "unlock",
+                    **_BASE_INFO,
                     "startTime": "2021-03-20T18:19:06.374Z",
                     "context": {
-                        "transactionID": "_oJRZKJsx",
+                        **_BASE_CONTEXT,
                         "startDate": "2021-03-20T18:19:06.372Z",
-                        "retryCount": 1,
                     },
-                    "lockType": "lock_version_1001",
-                    "serialNumber": "M1FBA029QJ",
-                    "rssi": -53,
-                    "wlanRSSI": -55,
-                    "wlanSNR": 44,
-                    "duration": 2534,
                 },
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "locking"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:31.273Z"),
+            [(LockOperationActivity, {"action": "locking"})],
+            id="locking",
+        ),
+        pytest.param(
+            _TS_BASE_NEXT,
             {
                 "remoteEvent": 1,
                 "status": "FAILED_BRIDGE_ERROR_LOCK_JAMMED",
                 "info": {
-                    "action": "unlock",
+                    **_BASE_INFO,
                     "startTime": "2021-03-20T18:19:06.374Z",
                     "context": {
-                        "transactionID": "_oJRZKJsx",
+                        **_BASE_CONTEXT,
                         "startDate": "2021-03-20T18:19:06.372Z",
-                        "retryCount": 1,
                     },
-                    "lockType": "lock_version_1001",
-                    "serialNumber": "M1FBA029QJ",
-                    "rssi": -53,
-                    "wlanRSSI": -55,
-                    "wlanSNR": 44,
-                    "duration": 2534,
                 },
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert activities[0].activity_start_time == dateutil.parser.parse(
-            "2021-03-20T18:19:06.374Z"
-        ).astimezone(tz=tzlocal()).replace(tzinfo=None)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "jammed"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:31.273Z"),
+            [
+                (
+                    LockOperationActivity,
+                    {
+                        "action": "jammed",
+                        "activity_start_time": _TS_UNLATCH_LOCAL,
+                    },
+                )
+            ],
+            id="jammed",
+        ),
+        pytest.param(
+            _TS_BASE_NEXT,
             {
                 "remoteEvent": 1,
                 "status": "kAugLockState_Unlocked",
                 "info": {
-                    "action": "unlock",
+                    **_BASE_INFO,
                     "startTime": "2021-03-20T18:19:06.374Z",
                     "context": {
-                        "transactionID": "_oJRZKJsx",
+                        **_BASE_CONTEXT,
                         "startDate": "2021-03-20T18:19:06.372Z",
-                        "retryCount": 1,
                     },
-                    "lockType": "lock_version_1001",
-                    "serialNumber": "M1FBA029QJ",
-                    "rssi": -53,
-                    "wlanRSSI": -55,
-                    "wlanSNR": 44,
-                    "duration": 2534,
                 },
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].activity_start_time == dateutil.parser.parse(
-            "2021-03-20T18:19:06.374Z"
-        ).astimezone(tz=tzlocal()).replace(tzinfo=None)
-        assert activities[0].action == "unlock"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
+            [
+                (
+                    LockOperationActivity,
+                    {
+                        "action": "unlock",
+                        "activity_start_time": _TS_UNLATCH_LOCAL,
+                    },
+                )
+            ],
+            id="unlocked",
+        ),
+        pytest.param(
+            _TS_BASE,
             {
                 "status": "locked",
                 "callingUserID": "8918341e-7e68-4079-ad0a-1fa8a45d855b",
                 "doorState": "closed",
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "lock"
-        assert activities[0].operated_by is None
-        assert isinstance(activities[1], DoorOperationActivity)
-        assert "DoorOperationActivity" in str(activities[1])
-        assert activities[1].action == "doorclosed"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
+            [
+                (LockOperationActivity, {"action": "lock", "operated_by": None}),
+                (DoorOperationActivity, {"action": "doorclosed"}),
+            ],
+            id="locked-doorclosed",
+        ),
+        pytest.param(
+            _TS_BASE,
             {
                 "status": "locked",
                 "callingUserID": "8918341e-7e68-4079-ad0a-1fa8a45d855b",
                 "doorState": "open",
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert activities[0].action == "lock"
-        assert activities[0].operated_by is None
-        assert (
-            activities[0].activity_type == ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR
-        )
-        assert isinstance(activities[1], DoorOperationActivity)
-        assert activities[1].action == "dooropen"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
+            [
+                (
+                    LockOperationActivity,
+                    {
+                        "action": "lock",
+                        "operated_by": None,
+                        "activity_type": ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR,
+                    },
+                ),
+                (DoorOperationActivity, {"action": "dooropen"}),
+            ],
+            id="locked-dooropen",
+        ),
+        pytest.param(
+            _TS_BASE,
             {
                 "status": "locked",
                 "callingUserID": "cccca94e-373e-aaaa-bbbb-333396827777",
                 "doorState": "closed",
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert activities[0].action == "lock"
-        assert activities[0].operated_by is None
-        assert (
-            activities[0].activity_type == ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR
-        )
-        assert isinstance(activities[1], DoorOperationActivity)
-        assert activities[1].action == "doorclosed"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T11:48:30.272Z"),
+            [
+                (
+                    LockOperationActivity,
+                    {
+                        "action": "lock",
+                        "operated_by": None,
+                        "activity_type": ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR,
+                    },
+                ),
+                (DoorOperationActivity, {"action": "doorclosed"}),
+            ],
+            id="locked-unknown-user",
+        ),
+        pytest.param(
+            _TS_LATER,
             {
                 LOCK_STATUS_KEY: "DoorStateChanged",
                 "lockID": "xxx",
                 "timeStamp": 1615087688187,
             },
-        )
-        assert not activities
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T12:48:30.272Z"),
+            [],
+            id="door-state-changed-ignored",
+        ),
+        pytest.param(
+            _parse("2017-12-10T12:48:30.272Z"),
             {
                 DOOR_STATE_KEY: "init",
                 "lockID": "xxx",
                 "timeStamp": 1615087688187,
             },
-        )
-        assert not activities
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T11:48:30.272Z"),
+            [],
+            id="door-state-init-ignored",
+        ),
+        pytest.param(
+            _TS_LATER,
             {
                 LOCK_STATUS_KEY: "associated_bridge_offline",
                 "lockID": "xxx",
                 "timeStamp": 1615087688187,
             },
-        )
-        assert isinstance(activities[0], BridgeOperationActivity)
-        assert activities[0].action == "associated_bridge_offline"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T11:48:30.272Z"),
+            [(BridgeOperationActivity, {"action": "associated_bridge_offline"})],
+            id="bridge-offline",
+        ),
+        pytest.param(
+            _TS_LATER,
             {
                 LOCK_STATUS_KEY: "associated_bridge_online",
                 "lockID": "xxx",
                 "timeStamp": 1615087688187,
             },
-        )
-        assert isinstance(activities[0], BridgeOperationActivity)
-        assert activities[0].action == "associated_bridge_online"
-
-        cache_user_info(
-            "5309b78d-de0c-4ec5-b878-02784c3b598a",
-            {"FirstName": "bob", "LastName": "smith"},
-        )
-        assert get_user_info("5309b78d-de0c-4ec5-b878-02784c3b598a") is not None
-
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {
-                "status": "unlocked",
-                "callingUserID": "5309b78d-de0c-4ec5-b878-02784c3b598a",
-                "doorState": "closed",
-                "info": {
-                    "action": "unlock",
-                    "startTime": "2017-12-10T05:48:30.272Z",
-                    "context": {
-                        "transactionID": "_oJRZKJsx",
-                        "startDate": "2017-12-10T05:48:30.272Z",
-                        "retryCount": 1,
-                    },
-                    "lockType": "lock_version_1001",
-                    "serialNumber": "M1FBA029QJ",
-                    "rssi": -53,
-                    "wlanRSSI": -55,
-                    "wlanSNR": 44,
-                    "duration": 2534,
-                },
-            },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "unlock"
-        assert activities[0].operated_by == "bob smith"
-
-        activities = activities_from_pubnub_message(
-            lock,
-            datetime.datetime.fromtimestamp(
-                16844292526891571 / 10_000_000, tz=datetime.timezone.utc
-            ),
+            [(BridgeOperationActivity, {"action": "associated_bridge_online"})],
+            id="bridge-online",
+        ),
+        pytest.param(
+            _TS_MANUAL_UNLATCH,
             {
                 "status": "unlatched",
                 "callingUserID": "manualunlatch",
                 "doorState": "open",
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "unlatch"
-        assert (
-            activities[0].activity_type is ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR
-        )
-        assert activities[0].operated_by is None
-
-        activities = activities_from_pubnub_message(
-            lock,
-            datetime.datetime.fromtimestamp(
-                16844292526891571 / 10_000_000, tz=datetime.timezone.utc
-            ),
+            [
+                (
+                    LockOperationActivity,
+                    {
+                        "action": "unlatch",
+                        "operated_by": None,
+                        "activity_type": ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR,
+                    },
+                ),
+                (DoorOperationActivity, {"action": "dooropen"}),
+            ],
+            id="manual-unlatch",
+        ),
+        pytest.param(
+            _TS_MANUAL_UNLATCH,
             {
                 "status": "unlocked",
                 "callingUserID": "manualunlock",
                 "doorState": "open",
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "unlock"
-        assert (
-            activities[0].activity_type is ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR
-        )
-        assert activities[0].operated_by is None
-
-        activities = activities_from_pubnub_message(
-            lock,
-            datetime.datetime.fromtimestamp(
-                16844299539729015 / 10_000_000, tz=datetime.timezone.utc
-            ),
+            [
+                (
+                    LockOperationActivity,
+                    {
+                        "action": "unlock",
+                        "operated_by": None,
+                        "activity_type": ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR,
+                    },
+                ),
+                (DoorOperationActivity, {"action": "dooropen"}),
+            ],
+            id="manual-unlock",
+        ),
+        pytest.param(
+            _TS_MANUAL_LOCK,
             {
                 "status": "locked",
                 "callingUserID": "manuallock",
                 "doorState": "open",
             },
-        )
-        assert isinstance(activities[0], LockOperationActivity)
-        assert "LockOperationActivity" in str(activities[0])
-        assert activities[0].action == "lock"
-        assert (
-            activities[0].activity_type is ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR
-        )
-        assert activities[0].operated_by is None
-
-        # status polls should not create activities
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
+            [
+                (
+                    LockOperationActivity,
+                    {
+                        "action": "lock",
+                        "operated_by": None,
+                        "activity_type": ActivityType.LOCK_OPERATION_WITHOUT_OPERATOR,
+                    },
+                ),
+                (DoorOperationActivity, {"action": "dooropen"}),
+            ],
+            id="manual-lock",
+        ),
+        pytest.param(
+            _TS_BASE,
             {
                 "remoteEvent": 1,
                 "status": "kAugLockState_Locked",
@@ -405,277 +409,295 @@ class TestLockDetail(unittest.TestCase):
                 "totalTime": 1028,
                 "resultsFromOperationCache": False,
             },
-        )
-
-        assert len(activities) == 0
-
-
-class TestDetail(unittest.TestCase):
-    def test_update_doorbell_details_from_pubnub_message(self):
-        doorbell = DoorbellDetail(json.loads(load_fixture("get_doorbell.json")))
-        self.assertEqual("K98GiDT45GUL", doorbell.device_id)
-        self.assertEqual(
-            dateutil.parser.parse("2017-12-10T08:01:35Z"),
-            doorbell.image_created_at_datetime,
-        )
-        self.assertEqual(
-            "https://image.com/vmk16naaaa7ibuey7sar.jpg", doorbell.image_url
-        )
-        activities = activities_from_pubnub_message(
-            doorbell,
-            dateutil.parser.parse("2021-03-16T01:07:08.817Z"),
-            {
-                "status": "imagecapture",
-                "data": {
-                    "event": "imagecapture",
-                    "result": {
-                        "created_at": "2021-03-16T01:07:08.817Z",
-                        "secure_url": "https://dyu7azbnaoi74.cloudfront.net/zip/images/zip.jpeg",
-                    },
+            [],
+            id="status-poll-ignored",
+        ),
+    ],
+)
+def test_update_lock_details_from_pubnub_message(
+    lock_detail, timestamp, message, expected
+):
+    """Each pubnub lock message yields the expected activities."""
+    _check_activities(
+        activities_from_pubnub_message(lock_detail, timestamp, message), expected
+    )
+
+
+def test_lock_operated_by_cached_user(lock_detail):
+    """A cached calling user shows up as the activity operator."""
+    cache_user_info(
+        "5309b78d-de0c-4ec5-b878-02784c3b598a",
+        {"FirstName": "bob", "LastName": "smith"},
+    )
+    assert get_user_info("5309b78d-de0c-4ec5-b878-02784c3b598a") is not None
+
+    activities = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {
+            "status": "unlocked",
+            "callingUserID": "5309b78d-de0c-4ec5-b878-02784c3b598a",
+            "doorState": "closed",
+            "info": {
+                **_BASE_INFO,
+                "startTime": "2017-12-10T05:48:30.272Z",
+                "context": {
+                    **_BASE_CONTEXT,
+                    "startDate": "2017-12-10T05:48:30.272Z",
                 },
             },
-        )
-        assert isinstance(activities[0], DoorbellImageCaptureActivity)
-        assert "DoorbellImageCaptureActivity" in str(activities[0])
-
-        assert (
-            activities[0].image_url
-            == "https://dyu7azbnaoi74.cloudfront.net/zip/images/zip.jpeg"
-        )
-        assert activities[0].image_created_at_datetime == dateutil.parser.parse(
-            "2021-03-16T01:07:08.817Z"
-        )
-
-        activities = activities_from_pubnub_message(
-            doorbell,
-            dateutil.parser.parse("2021-03-16T01:07:08.817Z"),
-            {
-                "status": "imagecapture",
-                "data": {
-                    "event": "imagecapture",
-                    "result": {
-                        "created_at": "2021-03-16T01:07:08.817Z",
-                        "secure_url": "https://dyu7azbnaoi74.cloudfront.net/zip/images/zip.jpeg",
-                    },
+        },
+    )
+    _check_activities(
+        activities,
+        [
+            (LockOperationActivity, {"action": "unlock", "operated_by": "bob smith"}),
+            (DoorOperationActivity, {"action": "doorclosed"}),
+        ],
+    )
+
+
+def test_update_doorbell_details_from_pubnub_message(doorbell_detail):
+    assert doorbell_detail.device_id == "K98GiDT45GUL"
+    assert doorbell_detail.image_created_at_datetime == _parse("2017-12-10T08:01:35Z")
+    assert doorbell_detail.image_url == "https://image.com/vmk16naaaa7ibuey7sar.jpg"
+    activities = activities_from_pubnub_message(
+        doorbell_detail,
+        _TS_IMAGECAPTURE,
+        {**_IMAGECAPTURE_MSG, "data": {**_IMAGECAPTURE_MSG["data"]}},
+    )
+    _check_activities(
+        activities,
+        [
+            (
+                DoorbellImageCaptureActivity,
+                {
+                    "image_url": "https://dyu7azbnaoi74.cloudfront.net/zip/images/zip.jpeg",
+                    "image_created_at_datetime": _TS_IMAGECAPTURE,
                 },
-            },
-        )
-        assert isinstance(activities[0], DoorbellImageCaptureActivity)
-        assert (
-            activities[0].image_url
-            == "https://dyu7azbnaoi74.cloudfront.net/zip/images/zip.jpeg"
-        )
-        assert activities[0].image_created_at_datetime == dateutil.parser.parse(
-            "2021-03-16T01:07:08.817Z"
-        )
-
-        activities = activities_from_pubnub_message(
-            doorbell,
-            dateutil.parser.parse("2021-03-16T01:07:08.817Z"),
-            {
-                "status": "doorbell_motion_detected",
+            )
+        ],
+    )
+
+    activities = activities_from_pubnub_message(
+        doorbell_detail,
+        _TS_IMAGECAPTURE,
+        {**_IMAGECAPTURE_MSG, "data": {**_IMAGECAPTURE_MSG["data"]}},
+    )
+    _check_activities(
+        activities,
+        [
+            (
+                DoorbellImageCaptureActivity,
+                {
+                    "image_url": "https://dyu7azbnaoi74.cloudfront.net/zip/images/zip.jpeg",
+                    "image_created_at_datetime": _TS_IMAGECAPTURE,
+                },
+            )
+        ],
+    )
+
+    activities = activities_from_pubnub_message(
+        doorbell_detail,
+        _TS_IMAGECAPTURE,
+        {
+            "status": "doorbell_motion_detected",
+            "callID": None,
+            "origin": "mars-api",
+            "data": {
+                "event": "doorbell_motion_detected",
+                "image": {
+                    "height": 640,
+                    "width": 480,
+                    "format": "jpg",
+                    "created_at": "2021-03-16T02:36:26.886Z",
+                    "bytes": 14061,
+                    "secure_url": "https://dyu7azbnaoi74.cloudfront.net/images/1f8.jpeg",
+                    "url": "https://dyu7azbnaoi74.cloudfront.net/images/1f8.jpeg",
+                    "etag": "09e839331c4ea59eef28081f2caa0e90",
+                },
+                "doorbellName": "Front Door",
                 "callID": None,
                 "origin": "mars-api",
-                "data": {
-                    "event": "doorbell_motion_detected",
-                    "image": {
-                        "height": 640,
-                        "width": 480,
-                        "format": "jpg",
-                        "created_at": "2021-03-16T02:36:26.886Z",
-                        "bytes": 14061,
-                        "secure_url": "https://dyu7azbnaoi74.cloudfront.net/images/1f8.jpeg",
-                        "url": "https://dyu7azbnaoi74.cloudfront.net/images/1f8.jpeg",
-                        "etag": "09e839331c4ea59eef28081f2caa0e90",
-                    },
-                    "doorbellName": "Front Door",
-                    "callID": None,
-                    "origin": "mars-api",
-                    "mutableContent": True,
-                },
+                "mutableContent": True,
             },
-        )
-        assert isinstance(activities[0], DoorbellMotionActivity)
-        assert (
-            activities[0].image_url
-            == "https://dyu7azbnaoi74.cloudfront.net/images/1f8.jpeg"
-        )
-        assert activities[0].image_created_at_datetime == dateutil.parser.parse(
-            "2021-03-16T02:36:26.886Z"
-        )
-
-        activities = activities_from_pubnub_message(
-            doorbell,
-            dateutil.parser.parse("2021-03-16T01:07:08.817Z"),
-            {
-                "status": "buttonpush",
-                "origin": "mars-api",
-                "data": {
-                    "doorbellID": "26593a60f5d6",
-                    "event": "buttonpush",
-                    "doorbellName": "Front Door",
-                    "origin": "mars-api",
+        },
+    )
+    _check_activities(
+        activities,
+        [
+            (
+                DoorbellMotionActivity,
+                {
+                    "image_url": "https://dyu7azbnaoi74.cloudfront.net/images/1f8.jpeg",
+                    "image_created_at_datetime": _parse("2021-03-16T02:36:26.886Z"),
                 },
-            },
-        )
-        assert isinstance(activities[0], DoorbellDingActivity)
-        assert "DoorbellDingActivity" in str(activities[0])
+            )
+        ],
+    )
 
+    activities = activities_from_pubnub_message(
+        doorbell_detail,
+        _TS_IMAGECAPTURE,
+        {
+            "status": "buttonpush",
+            "origin": "mars-api",
+            "data": {
+                "doorbellID": "26593a60f5d6",
+                "event": "buttonpush",
+                "doorbellName": "Front Door",
+                "origin": "mars-api",
+            },
+        },
+    )
+    _check_activities(activities, [(DoorbellDingActivity, {})])
 
-class TestBridge(unittest.TestCase):
-    def test_update_bridge_details_from_pubnub_message(self):
-        lock = LockDetail(json.loads(load_fixture("get_lock.doorsense_init.json")))
-        self.assertEqual("A6697750D607098BAE8D6BAA11EF8063", lock.device_id)
-        self.assertEqual(LockStatus.LOCKED, lock.lock_status)
-        self.assertEqual(LockDoorStatus.DISABLED, lock.door_state)
 
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {
-                "remoteEvent": 1,
-                "status": "unknown",
-                "result": "failed",
-                "error": {
-                    "jse_shortmsg": "",
-                    "jse_info": {},
-                    "message": "Bridge is offline",
-                    "statusCode": 422,
-                    "body": {"code": 98, "message": "Bridge is offline"},
-                    "restCode": 98,
-                    "name": "ERRNO_BRIDGE_OFFLINE",
-                    "code": "Error",
-                },
-                "info": {
-                    "lockID": "45E3635D35B9471FAF1218885816E90D",
-                    "action": "status",
-                },
-            },
-        )
-        assert isinstance(activities[0], BridgeOperationActivity)
-        assert "BridgeOperationActivity" in str(activities[0])
-        assert activities[0].action == "associated_bridge_offline"
-
-    def test_websocket_source_handling(self):
-        lock = LockDetail(json.loads(load_fixture("get_lock.doorsense_init.json")))
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {"status": "kAugLockState_Locked"},
-            source=SOURCE_WEBSOCKET,
-        )
-        assert len(activities) == 1
-        assert activities[0].source == SOURCE_WEBSOCKET
-
-    def test_pubnub_source_default(self):
-        lock = LockDetail(json.loads(load_fixture("get_lock.doorsense_init.json")))
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {"status": "kAugLockState_Locked"},
-        )
-        assert len(activities) == 1
-        assert activities[0].source == SOURCE_PUBNUB
-
-    def test_is_status_property(self):
-        """Test is_status property correctly identifies status updates."""
-        lock = LockDetail(json.loads(load_fixture("get_lock.doorsense_init.json")))
-
-        # Test normal lock operation is not a status
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {
-                "status": "kAugLockState_Locked",
-                "info": {"action": "lock", "startTime": "2017-12-10T05:48:30.272Z"},
-                "callingUserID": "user123",
-            },
-        )
-        assert len(activities) == 1
-        assert activities[0].is_status is False
-
-        # Test status update with no info and no user
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {"status": "kAugLockState_Locked"},
-        )
-        assert len(activities) == 1
-        assert activities[0].is_status is True
-
-        # Test manual operation is not a status
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {
-                "status": "kAugLockState_Locked",
-                "callingUserID": "manuallock",
-            },
-        )
-        assert len(activities) == 1
-        assert activities[0].is_status is False
-        # Manual operations without timestamps don't store the user ID but mark as manual
-        assert activities[0].operated_manual is True
-
-        # Test WebSocket messages with empty info are not status
-        activities = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {"status": "kAugLockState_Locked"},
-            source=SOURCE_WEBSOCKET,
-        )
-        assert len(activities) == 1
-        assert activities[0].is_status is False
-
-    def test_pubnub_duplicate_state_detection(self):
-        """Test that duplicate PubNub messages with same state are detected."""
-        lock = LockDetail(json.loads(load_fixture("get_lock.doorsense_init.json")))
-
-        # First message - manual lock when already locked
-        activities1 = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
-            {
-                "status": "locked",
-                "callingUserID": "manuallock",
-                "doorState": "closed",
+def test_update_bridge_details_from_pubnub_message(lock_detail):
+    activities = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {
+            "remoteEvent": 1,
+            "status": "unknown",
+            "result": "failed",
+            "error": {
+                "jse_shortmsg": "",
+                "jse_info": {},
+                "message": "Bridge is offline",
+                "statusCode": 422,
+                "body": {"code": 98, "message": "Bridge is offline"},
+                "restCode": 98,
+                "name": "ERRNO_BRIDGE_OFFLINE",
+                "code": "Error",
             },
-            source=SOURCE_PUBNUB,
-        )
-        assert len(activities1) == 2  # lock and door activities
-        assert activities1[0].action == "lock"
-        assert activities1[1].action == "doorclosed"
-
-        # Second identical message should still create activities
-        # (state tracking happens at the manager level, not here)
-        activities2 = activities_from_pubnub_message(
-            lock,
-            dateutil.parser.parse("2017-12-10T05:48:31.272Z"),
-            {
-                "status": "locked",
-                "callingUserID": "manuallock",
-                "doorState": "closed",
+            "info": {
+                "lockID": "45E3635D35B9471FAF1218885816E90D",
+                "action": "status",
             },
-            source=SOURCE_PUBNUB,
-        )
-        assert len(activities2) == 2
-        assert activities2[0].action == "lock"
-        assert activities2[1].action == "doorclosed"
-        # Both should NOT be marked as status since they have manual flag
-        assert (
-            activities2[0].is_status is False
-        )  # manual lock operations are not status
-        assert (
-            activities2[1].is_status is False
-        )  # door activity with manual flag is not status
-
-
-def test_lock_message_uses_context_start_date_when_start_time_missing():
+        },
+    )
+    _check_activities(
+        activities, [(BridgeOperationActivity, {"action": "associated_bridge_offline"})]
+    )
+
+
+def test_websocket_source_handling(lock_detail):
+    activities = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {"status": "kAugLockState_Locked"},
+        source=SOURCE_WEBSOCKET,
+    )
+    assert len(activities) == 1
+    assert activities[0].source == SOURCE_WEBSOCKET
+
+
+def test_pubnub_source_default(lock_detail):
+    activities = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {"status": "kAugLockState_Locked"},
+    )
+    assert len(activities) == 1
+    assert activities[0].source == SOURCE_PUBNUB
+
+
+def test_is_status_property(lock_detail):
+    """Test is_status property correctly identifies status updates."""
+
+    # Test normal lock operation is not a status
+    activities = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {
+            "status": "kAugLockState_Locked",
+            "info": {"action": "lock", "startTime": "2017-12-10T05:48:30.272Z"},
+            "callingUserID": "user123",
+        },
+    )
+    assert len(activities) == 1
+    assert activities[0].is_status is False
+
+    # Test status update with no info and no user
+    activities = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {"status": "kAugLockState_Locked"},
+    )
+    assert len(activities) == 1
+    assert activities[0].is_status is True
+
+    # Test manual operation is not a status
+    activities = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {
+            "status": "kAugLockState_Locked",
+            "callingUserID": "manuallock",
+        },
+    )
+    assert len(activities) == 1
+    assert activities[0].is_status is False
+    # Manual operations without timestamps don't store the user ID but mark as manual
+    assert activities[0].operated_manual is True
+
+    # Test WebSocket messages with empty info are not status
+    activities = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {"status": "kAugLockState_Locked"},
+        source=SOURCE_WEBSOCKET,
+    )
+    assert len(activities) == 1
+    assert activities[0].is_status is False
+
+
+def test_pubnub_duplicate_state_detection(lock_detail):
+    """Test that duplicate PubNub messages with same state are detected."""
+
+    # First message - manual lock when already locked
+    activities1 = activities_from_pubnub_message(
+        lock_detail,
+        _TS_BASE,
+        {
+            "status": "locked",
+            "callingUserID": "manuallock",
+            "doorState": "closed",
+        },
+        source=SOURCE_PUBNUB,
+    )
+    assert len(activities1) == 2  # lock and door activities
+    assert activities1[0].action == "lock"
+    assert activities1[1].action == "doorclosed"
+
+    # Second identical message should still create activities
+    # (state tracking happens at the manager level, not here)
+    activities2 = activities_from_pubnub_message(
+        lock_detail,
+        _parse("2017-12-10T05:48:31.272Z"),
+        {
+            "status": "locked",
+            "callingUserID": "manuallock",
+            "doorState": "closed",
+        },
+        source=SOURCE_PUBNUB,
+    )
+    assert len(activities2) == 2
+    assert activities2[0].action == "lock"
+    assert activities2[1].action == "doorclosed"
+    # Both should NOT be marked as status since they have manual flag
+    assert activities2[0].is_status is False  # manual lock operations are not status
+    assert (
+        activities2[1].is_status is False
+    )  # door activity with manual flag is not status
+
+
+def test_lock_message_uses_context_start_date_when_start_time_missing(lock_detail):
     """Cover the elif 'startDate' in context branch (no info.startTime)."""
-    lock = LockDetail(json.loads(load_fixture("get_lock.doorsense_init.json")))
     activities = activities_from_pubnub_message(
-        lock,
-        dateutil.parser.parse("2017-12-10T05:48:30.272Z"),
+        lock_detail,
+        _TS_BASE,
         {
             "remoteEvent": 1,
             "status": "kAugLockState_Locked",
@@ -692,23 +714,21 @@ def test_lock_message_uses_context_start_date_when_start_time_missing():
     assert activities[0].operated_by is None or True  # smoke check, user accepted
 
 
-def test_doorbell_message_without_status_returns_empty():
+def test_doorbell_message_without_status_returns_empty(doorbell_detail):
     """Cover the 116->130 branch: DoorbellDetail but no DOORBELL_STATUS_KEY."""
-    doorbell = DoorbellDetail(json.loads(load_fixture("get_doorbell.json")))
     activities = activities_from_pubnub_message(
-        doorbell,
-        dateutil.parser.parse("2021-03-16T01:07:08.817Z"),
+        doorbell_detail,
+        _TS_IMAGECAPTURE,
         {"data": {"event": "imagecapture"}},
     )
     assert activities == []
 
 
-def test_doorbell_message_with_unhandled_status_returns_empty():
+def test_doorbell_message_with_unhandled_status_returns_empty(doorbell_detail):
     """Cover the 123->130 branch: status present but not in the action tuple."""
-    doorbell = DoorbellDetail(json.loads(load_fixture("get_doorbell.json")))
     activities = activities_from_pubnub_message(
-        doorbell,
-        dateutil.parser.parse("2021-03-16T01:07:08.817Z"),
+        doorbell_detail,
+        _TS_IMAGECAPTURE,
         {"status": "some_unknown_doorbell_event", "data": {}},
     )
     assert activities == []
@@ -723,7 +743,7 @@ def test_unknown_device_type_returns_empty():
     )
     activities = activities_from_pubnub_message(
         generic_device,
-        dateutil.parser.parse("2021-03-16T01:07:08.817Z"),
+        _TS_IMAGECAPTURE,
         {"status": "kAugLockState_Locked"},
     )
     assert activities == []
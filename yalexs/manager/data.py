@@ -162,48 +162,54 @@ class YaleXSData(SubscriberMixin):
         """Fetch capabilities for all locks from the API."""
         token = await self._gateway.async_get_access_token()
 
-        # Fetch capabilities for each lock in series to keep API load low
-        for lock_id, lock_detail in self._device_detail_by_id.items():
-            if lock_id not in self._locks_by_id or not isinstance(
-                lock_detail, LockDetail
-            ):
-                continue
+        # Fetch capabilities for all locks concurrently; each fetch is
+        # network-bound and failures are logged per lock.
+        if tasks := [
+            create_eager_task(
+                self._async_fetch_lock_capability(token, lock_id, lock_detail)
+            )
+            for lock_id, lock_detail in self._device_detail_by_id.items()
+            if lock_id in self._locks_by_id and isinstance(lock_detail, LockDetail)
+        ]:
+            await asyncio.gather(*tasks)
 
-            # lock_id is the serial_number for locks
-            try:
-                capabilities = await self._api.async_get_lock_capabilities(
-                    token, lock_id
-                )
-                lock_detail.set_capabilities(capabilities)
+    async def _async_fetch_lock_capability(
+        self, token: str, lock_id: str, lock_detail: LockDetail
+    ) -> None:
+        """Fetch and apply capabilities for a single lock."""
+        # lock_id is the serial_number for locks
+        try:
+            capabilities = await self._api.async_get_lock_capabilities(token, lock_id)
+            lock_detail.set_capabilities(capabilities)
+            _LOGGER.debug(
+                "Fetched capabilities for lock %s: unlatch=%s",
+                lock_detail.device_name,
+                capabilities.get("lock", {}).get("unlatch", False),
+            )
+        except YaleApiError as ex:
+            # 409 Conflict means the API cannot determine device type from serial
+            # 404 Not Found means device info not found
+            # These can happen for older devices, just log debug and continue
+            if ex.status in (404, 409):
                 _LOGGER.debug(
-                    "Fetched capabilities for lock %s: unlatch=%s",
+                    "Cannot fetch capabilities for lock %s (HTTP %s): %s",
                     lock_detail.device_name,
-                    capabilities.get("lock", {}).get("unlatch", False),
+                    ex.status,
+                    str(ex),
                 )
-            except YaleApiError as ex:
-                # 409 Conflict means the API cannot determine device type from serial
-                # 404 Not Found means device info not found
-                # These can happen for older devices, just log debug and continue
-                if ex.status in (404, 409):
-                    _LOGGER.debug(
-                        "Cannot fetch capabilities for lock %s (HTTP %s): %s",
-                        lock_detail.device_name,
-                        ex.status,
-                        str(ex),
-                    )
-                else:
-                    _LOGGER.warning(
-                        "Failed to fetch capabilities for lock %s (HTTP %s): %s",
-                        lock_detail.device_name,
-                        ex.status,
-                        str(ex),
-                    )
-            except (ClientError, TimeoutError) as ex:
+            else:
                 _LOGGER.warning(
-                    "Failed to fetch capabilities for lock %s: %s",
+                    "Failed to fetch capabilities for lock %s (HTTP %s): %s",
                     lock_detail.device_name,
-                    ex,
+                    ex.status,
+                    str(ex),
                 )
+        except (ClientError, TimeoutError) as ex:
+            _LOGGER.warning(
+                "Failed to fetch capabilities for lock %s: %s",
+                lock_detail.device_name,
+                ex,
+            )
 
     async def _async_initial_sync(self) -> None:
         """Attempt to request an initial sync."""